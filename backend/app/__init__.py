@@ -18,10 +18,12 @@ from .auth import auth_bp
 from .geocoding_routes import geocoding_bp
 from .db import init_db, check_db_connection
 from .logging_config import configure_logging
+from .json_provider import ORJSONProvider
 import sys
 
 def create_app():
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
     
     # Configure logging first (before any log statements)
     configure_logging(app)
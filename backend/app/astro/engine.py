@@ -1,6 +1,8 @@
 import swisseph as swe
 from datetime import datetime
 import logging
+import threading
+from functools import lru_cache
 from .constants import PLANETS, AYANAMSHA, HOUSE_CODES, SEFLAGS
 from .utils import norm360, sign_index, house_from_sign
 
@@ -10,23 +12,39 @@ logger = logging.getLogger(__name__)
 # Module-level variable to track current ayanamsha
 _current_ayanamsha_key = None
 
+# (ephe_path, ayanamsha_key) the Swiss Ephemeris globals were last set to;
+# repeat calls with the same settings skip set_ephe_path (which resets
+# swisseph's open files and caches) and set_sid_mode
+_ephe_state = None
+_ephe_lock = threading.Lock()
+
 def init_ephemeris(ephe_path: str, ayanamsha_key: str):
-    """Initialize Swiss Ephemeris with path and ayanamsha"""
-    global _current_ayanamsha_key
+    """Initialize Swiss Ephemeris with path and ayanamsha (no-op if already set)"""
+    global _current_ayanamsha_key, _ephe_state
     
-    logger.debug(f"Initializing ephemeris - Path: {ephe_path}, Ayanamsha: {ayanamsha_key}")
+    state = (ephe_path, ayanamsha_key)
+    if _ephe_state == state:
+        return
     
-    try:
-        swe.set_ephe_path(ephe_path)
-        _current_ayanamsha_key = ayanamsha_key
-        # For VEDANJANAM, use Lahiri mode internally (we'll apply offset manually)
-        sid_mode = AYANAMSHA[ayanamsha_key]
-        swe.set_sid_mode(sid_mode)
+    with _ephe_lock:
+        if _ephe_state == state:
+            return
         
-        logger.debug(f"Ephemeris initialized successfully with ayanamsha: {ayanamsha_key}")
-    except Exception as e:
-        logger.error(f"Failed to initialize ephemeris: {str(e)}", exc_info=True)
-        raise
+        logger.debug(f"Initializing ephemeris - Path: {ephe_path}, Ayanamsha: {ayanamsha_key}")
+        
+        try:
+            if _ephe_state is None or _ephe_state[0] != ephe_path:
+                swe.set_ephe_path(ephe_path)
+            _current_ayanamsha_key = ayanamsha_key
+            # For VEDANJANAM, use Lahiri mode internally (we'll apply offset manually)
+            sid_mode = AYANAMSHA[ayanamsha_key]
+            swe.set_sid_mode(sid_mode)
+            _ephe_state = state
+            
+            logger.debug(f"Ephemeris initialized successfully with ayanamsha: {ayanamsha_key}")
+        except Exception as e:
+            logger.error(f"Failed to initialize ephemeris: {str(e)}", exc_info=True)
+            raise
 
 def julian_day_utc(dt_utc: datetime) -> float:
     """Convert UTC datetime to Julian Day"""
@@ -148,6 +166,28 @@ def compute_planets(jd_ut: float, nodeType: str = "MEAN"):
     
     return out
 
+def compute_moon_longitude(jd_ut: float) -> float:
+    """
+    Compute only the Moon's sidereal longitude (ayanamsha set by init_ephemeris).
+    
+    Fast path for callers that need nothing but the Moon (e.g. Vimshottari
+    dasha): one Swiss Ephemeris call instead of compute_planets' ~17.
+    Matches the Moon entry of compute_planets() exactly.
+    
+    Raises:
+        RuntimeError: If Swiss Ephemeris calculation fails
+    """
+    try:
+        result = swe.calc_ut(jd_ut, swe.MOON, SEFLAGS)
+    except Exception as e:
+        raise RuntimeError(f"Failed to calculate position for Moon: {e}")
+    
+    lng = norm360(float(result[0][0]))
+    # Same VEDANJANAM adjustment as compute_planets (Lahiri + 6 arc minutes)
+    if _current_ayanamsha_key == "VEDANJANAM":
+        lng = norm360(lng - 0.1)
+    return lng
+
 def ascendant_and_houses(jd_ut: float, lat: float, lon: float, houseSystem: str):
     """
     Calculate ascendant, house cusps, and the four angles in sidereal mode.
@@ -158,32 +198,47 @@ def ascendant_and_houses(jd_ut: float, lat: float, lon: float, houseSystem: str)
             - cusps_list: List of 12 house cusps (or None for WHOLE_SIGN)
             - angles_dict: Dictionary with keys 'asc', 'mc', 'ic', 'dsc'
     """
+    asc, cusps, (mc, ic, dsc) = _ascendant_and_houses(
+        jd_ut, lat, lon, houseSystem, _current_ayanamsha_key
+    )
+    angles = {"asc": asc, "mc": mc, "ic": ic, "dsc": dsc}
+    return asc, list(cusps) if cusps is not None else None, angles
+
+
+@lru_cache(maxsize=4096)
+def _ascendant_and_houses(jd_ut: float, lat: float, lon: float, houseSystem: str,
+                          ayanamsha_key: str):
+    """Memoized houses_ex call returning (asc, cusps, (mc, ic, dsc)) as tuples.
+
+    The ayanamsha is part of the key: houses are computed in sidereal mode
+    (set by init_ephemeris) and VEDANJANAM shifts every angle, so the same
+    time and place gives different results per ayanamsha. Inputs are used
+    exactly, as for _sripati_cusps.
+    """
     hcode = HOUSE_CODES[houseSystem]
     
     # Use houses_ex with FLG_SIDEREAL - it handles the conversion automatically
     flags = swe.FLG_SIDEREAL | swe.FLG_SPEED | swe.FLG_TRUEPOS
     
     if hcode == "W":
-        # For WHOLE_SIGN, we use Placidus to get the angles, but don't use its cusps
-        cusps, ascmc = swe.houses_ex(jd_ut, lat, lon, b'P', flags)
+        # For WHOLE_SIGN only the angles are needed. ASC/MC don't depend on the
+        # house system, so ask for 'W' itself: it skips Placidus' iterative cusp
+        # solution and, unlike Placidus, works above the polar circles.
+        cusps, ascmc = swe.houses_ex(jd_ut, lat, lon, b'W', flags)
         asc = norm360(ascmc[0])
         mc = norm360(ascmc[1])
         # IC and DSC are calculated as opposites
         ic = norm360(mc + 180.0)
         dsc = norm360(asc + 180.0)
         
-        if _current_ayanamsha_key == "VEDANJANAM":
+        if ayanamsha_key == "VEDANJANAM":
             asc = norm360(asc - 0.1)
             mc = norm360(mc - 0.1)
             ic = norm360(ic - 0.1)
             dsc = norm360(dsc - 0.1)
         
-        angles = {"asc": asc, "mc": mc, "ic": ic, "dsc": dsc}
-        # Angles calculated - available for debug logging if needed
-        import logging
-        logging.debug(f"📐 Angles calculated: ASC={asc:.2f}°, MC={mc:.2f}°, IC={ic:.2f}°, DSC={dsc:.2f}°")
-        logger.debug(f"Angles calculated: ASC={asc:.2f}°, MC={mc:.2f}°, IC={ic:.2f}°, DSC={dsc:.2f}°")
-        return asc, None, angles
+        logger.debug("Angles calculated: ASC=%.2f°, MC=%.2f°, IC=%.2f°, DSC=%.2f°", asc, mc, ic, dsc)
+        return asc, None, (mc, ic, dsc)
     else:
         cusps, ascmc = swe.houses_ex(jd_ut, lat, lon, hcode.encode(), flags)
         asc = norm360(ascmc[0])
@@ -192,22 +247,27 @@ def ascendant_and_houses(jd_ut: float, lat: float, lon: float, houseSystem: str)
         ic = norm360(mc + 180.0)
         dsc = norm360(asc + 180.0)
         # Swiss Ephemeris returns cusps as a tuple with 12 elements (0-11)
-        cusps_list = [norm360(cusps[i]) for i in range(12)]
+        cusps_list = tuple(norm360(cusps[i]) for i in range(12))
         
-        if _current_ayanamsha_key == "VEDANJANAM":
+        if ayanamsha_key == "VEDANJANAM":
             asc = norm360(asc - 0.1)
             mc = norm360(mc - 0.1)
             ic = norm360(ic - 0.1)
             dsc = norm360(dsc - 0.1)
-            cusps_list = [norm360(c - 0.1) for c in cusps_list]
+            cusps_list = tuple(norm360(c - 0.1) for c in cusps_list)
         
-        angles = {"asc": asc, "mc": mc, "ic": ic, "dsc": dsc}
-        logger.debug(f"Angles calculated: ASC={asc:.2f}°, MC={mc:.2f}°, IC={ic:.2f}°, DSC={dsc:.2f}°")
-        return asc, cusps_list, angles
+        logger.debug("Angles calculated: ASC=%.2f°, MC=%.2f°, IC=%.2f°, DSC=%.2f°", asc, mc, ic, dsc)
+        return asc, cusps_list, (mc, ic, dsc)
+
+# Whole sign cusps depend only on the ascendant sign: 12 rows of 12 cusps
+_WHOLE_SIGN_CUSPS = tuple(
+    tuple(norm360(asc_sign * 30 + i * 30) for i in range(12))
+    for asc_sign in range(12)
+)
 
 def compute_whole_sign_cusps(asc_sign: int):
-    """Compute whole sign house cusps"""
-    return [norm360(asc_sign * 30 + i * 30) for i in range(12)]
+    """Compute whole sign house cusps (copied from a precomputed per-sign table)"""
+    return list(_WHOLE_SIGN_CUSPS[asc_sign % 12])
 
 def compute_sripati_cusps(asc: float, ic: float, dsc: float, mc: float):
     """
@@ -247,6 +307,18 @@ def compute_sripati_cusps(asc: float, ic: float, dsc: float, mc: float):
         list: 12 Bhava Sandhis (house boundaries) in degrees, starting from Sandhi 1/2
               Note: Sandhi N marks the boundary between house N and house N+1
     """
+    madhyas, sandhis = _sripati_cusps(asc, ic, dsc, mc)
+    return {"madhyas": list(madhyas), "sandhis": list(sandhis)}
+
+
+@lru_cache(maxsize=8192)
+def _sripati_cusps(asc: float, ic: float, dsc: float, mc: float):
+    """Memoized Sripati computation returning (madhyas, sandhis) as tuples.
+
+    Keyed on the exact angles rather than rounded ones: the sandhis decide
+    Bhav Chalit house placement, so a rounded key could move a boundary
+    across a planet. Tuples keep the cached values immutable.
+    """
     # Step 1: Calculate all 12 Bhava Madhyas (house centers)
     madhyas = []
     
@@ -306,4 +378,4 @@ def compute_sripati_cusps(asc: float, ic: float, dsc: float, mc: float):
         }
     })
 
-    return {"madhyas": madhya_list, "sandhis": sandhis}
+    return tuple(madhya_list), tuple(sandhis)
@@ -1,6 +1,8 @@
+from bisect import bisect_right
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from zoneinfo import ZoneInfo
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, Sequence, List
 import pytz
 from timezonefinder import TimezoneFinder
 
@@ -73,8 +75,15 @@ def _fallback_timezone_detection(latitude: float, longitude: float) -> str:
     # Default to UTC if no specific timezone detected
     return "UTC"
 
+@lru_cache(maxsize=4096)
 def to_utc(dt_iso: str, tz: Optional[str], offset_minutes: Optional[int], latitude: Optional[float] = None, longitude: Optional[float] = None) -> datetime:
-    """Convert ISO datetime string to UTC datetime, treating input as local time"""
+    """Convert ISO datetime string to UTC datetime, treating input as local time
+    
+    Memoized: the result is a pure function of the arguments (tz rules are
+    static per process), and repeat charts/dashas for the same birth data
+    skip the timezonefinder lookup and pytz localization. Returned datetimes
+    are immutable, so sharing them between callers is safe.
+    """
     naive = datetime.fromisoformat(dt_iso)
     
     # If timezone is explicitly provided, use it
@@ -144,8 +153,29 @@ def house_from_cusps(planet_long: float, cusps: list) -> int:
     # Fallback: should not reach here, but return house 1 if no match found
     return 1
 
+def houses_from_cusps(longitudes: Sequence[float], cusps: Sequence[float]) -> List[int]:
+    """
+    Assign house numbers for many longitudes at once from house-start cusps.
+    
+    For quadrant/equal systems: cusps[i] is where house i+1 begins, in zodiacal
+    order. Both cusps and longitudes are measured from cusps[0], so the 360°/0°
+    wraparound needs no special case; the relative cusps are computed once and
+    each longitude is then a single C-level bisect.
+    
+    Args:
+        longitudes: Planet longitudes in degrees (0-360)
+        cusps: 12 house cusps in degrees, cusps[0] = start of house 1
+        
+    Returns:
+        House numbers (1-12), in the order of longitudes
+    """
+    base = cusps[0]
+    cusps_rel = [(c - base) % 360.0 for c in cusps]
+    return [bisect_right(cusps_rel, (lon - base) % 360.0) for lon in longitudes]
+
+@lru_cache(maxsize=1440)
 def format_utc_offset(offset_minutes: int) -> str:
-    """Format UTC offset as string"""
+    """Format UTC offset as string (memoized: real-world offsets are a few dozen values)"""
     hours = abs(offset_minutes) // 60
     minutes = abs(offset_minutes) % 60
     sign = "+" if offset_minutes >= 0 else "-"
@@ -211,6 +241,10 @@ def _navamsha_start_sign_index_for_element(sign_index_0: int) -> int:
     raise ValueError(f"Invalid sign index {sign_index_0}. Must be 0-11 (Aries-Pisces).")
 
 
+# Navamsha starting sign per base sign (0..11), resolved once from the element rule
+_NAVAMSHA_START_SIGN = tuple(_navamsha_start_sign_index_for_element(i) for i in range(12))
+
+
 def get_navamsha_info(longitude_sidereal: float) -> Dict[str, object]:
     """Compute navamsha sign and related info from sidereal longitude.
 
@@ -228,7 +262,7 @@ def get_navamsha_info(longitude_sidereal: float) -> Dict[str, object]:
     degree_in_navamsha = deg_in_sign - (ordinal_1to9 - 1) * nav_span
 
     # Determine navamsha sign by element rule
-    start_sign = _navamsha_start_sign_index_for_element(base_sign_index)
+    start_sign = _NAVAMSHA_START_SIGN[base_sign_index]
     nav_sign_index = (start_sign + (ordinal_1to9 - 1)) % 12
     nav_sign_name = ZODIAC_SIGNS[nav_sign_index]
 
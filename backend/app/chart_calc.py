@@ -18,7 +18,7 @@ from .astro.utils import (
     to_utc,
     sign_index,
     house_from_sign,
-    house_from_cusps,
+    houses_from_cusps,
     format_utc_offset,
     get_nakshatra_and_charan,
     get_navamsha_info,
@@ -77,40 +77,50 @@ def calculate_chart_for_profile(profile):
     # Extract Sun's longitude once for combustion calculations
     sun_longitude = next((p["longitude"] for p in planets if p["planet"] == "Sun"), None)
 
+    # House placement from cusps for all planets in one pass
+    cusp_houses = None
+    if profile.house_system != "WHOLE_SIGN" and cusps:
+        cusp_houses = houses_from_cusps([p["longitude"] for p in planets], cusps)
+
     # Decorate planets with additional data (mirror /chart POST logic)
     result_planets = []
-    for p in planets:
-        rec = dict(p)
-
-        # Round core kinematics
-        rec["longitude"] = round(p["longitude"], 2)
-        rec["speed"] = round(p["speed"], 4)
-        if "latitude" in p:
-            rec["latitude"] = round(p["latitude"], 4)
-
-        # prevSpeed is internal-only; keep for derived metrics, then drop
-        prev_speed = rec.pop("prevSpeed", None)
+    for idx, p in enumerate(planets):
+        # Read the source fields once (each is used several times below)
+        name = p["planet"]
+        longitude = p["longitude"]
+        speed = p["speed"]
+
+        # Core kinematics, rounded, built as one literal (same key order as
+        # compute_planets' record; prevSpeed is internal-only and not emitted)
+        rec = {
+            "planet": name,
+            "longitude": round(longitude, 2),
+            "latitude": round(p["latitude"], 4),
+            "speed": round(speed, 4),
+            "retrograde": p["retrograde"],
+        }
+        prev_speed = p.get("prevSpeed")
 
         # Derived motion metrics
-        mean_speed = PLANET_MEAN_SPEEDS.get(p["planet"])
+        mean_speed = PLANET_MEAN_SPEEDS.get(name)
         if mean_speed is not None:
             rec["meanSpeed"] = round(mean_speed, 4)
 
         if prev_speed is not None:
-            acceleration = p["speed"] - prev_speed
+            acceleration = speed - prev_speed
             rec["acceleration"] = round(acceleration, 6)
-            rec["isAccelerating"] = abs(p["speed"]) > abs(prev_speed)
+            rec["isAccelerating"] = abs(speed) > abs(prev_speed)
 
-        threshold = STATIONARY_THRESHOLDS.get(p["planet"])
+        threshold = STATIONARY_THRESHOLDS.get(name)
         if threshold is not None:
-            rec["isStationary"] = abs(p["speed"]) <= threshold
+            rec["isStationary"] = abs(speed) <= threshold
         else:
             rec["isStationary"] = False
 
         # Combustion metrics relative to Sun
-        combust_thresholds = COMBUSTION_THRESHOLDS.get(p["planet"])
-        if combust_thresholds is not None and sun_longitude is not None and p["planet"] != "Sun":
-            diff = abs(p["longitude"] - sun_longitude)
+        combust_thresholds = COMBUSTION_THRESHOLDS.get(name)
+        if combust_thresholds is not None and sun_longitude is not None and name != "Sun":
+            diff = abs(longitude - sun_longitude)
             sun_distance = round(min(diff, 360.0 - diff), 4)
             direction = "retrograde" if p["retrograde"] else "direct"
             rec["sunDistance"] = sun_distance
@@ -120,8 +130,8 @@ def calculate_chart_for_profile(profile):
             rec["isCombust"] = False
 
         # Always include nakshatra, charan, and navamsha details (sidereal longitudes)
-        nak_name, nak_index_1, charan_1to4 = get_nakshatra_and_charan(p["longitude"])
-        nav_info = get_navamsha_info(p["longitude"])
+        nak_name, nak_index_1, charan_1to4 = get_nakshatra_and_charan(longitude)
+        nav_info = get_navamsha_info(longitude)
         rec["nakshatra"] = {"name": nak_name, "index": nak_index_1}
         rec["charan"] = charan_1to4
         rec["navamsha"] = {
@@ -131,23 +141,13 @@ def calculate_chart_for_profile(profile):
             "degreeInNavamsha": round(nav_info["degreeInNavamsha"], 4),
         }
 
-        # Sign and house placement
-        rec["signIndex"] = sign_index(p["longitude"])
+        # Sign and house placement (sign computed once, reused for whole-sign houses)
+        planet_sign = sign_index(longitude)
+        rec["signIndex"] = planet_sign
         if profile.house_system == "WHOLE_SIGN":
-            rec["house"] = house_from_sign(rec["signIndex"], asc_sign)
-        elif cusps:
-            planet_long = p["longitude"]
-            house_num = 1
-            for i, cusp in enumerate(cusps):
-                if i < len(cusps) - 1:
-                    next_cusp = cusps[i + 1]
-                else:
-                    next_cusp = cusps[0] + 360
-
-                if cusp <= planet_long < next_cusp or (i == len(cusps) - 1 and planet_long >= cusp):
-                    house_num = i + 1
-                    break
-            rec["house"] = house_num
+            rec["house"] = house_from_sign(planet_sign, asc_sign)
+        elif cusp_houses is not None:
+            rec["house"] = cusp_houses[idx]
 
         result_planets.append(rec)
     
@@ -161,13 +161,15 @@ def calculate_chart_for_profile(profile):
     sripati_madhyas = sripati_result["madhyas"]  # centers of each bhava (house cusps)
     sripati_sandhis = sripati_result["sandhis"]  # boundaries between bhavas
 
-    bhav_chalit_planets = []
-    for p in planets:
-        planet_house = house_from_cusps(p["longitude"], sripati_sandhis)
-        bhav_chalit_planets.append({
-            "planet": p["planet"],
-            "house": planet_house
-        })
+    # Sandhi N ends house N, so house N starts at Sandhi N-1 (house 1 at Sandhi 12/1)
+    bhav_chalit_houses = houses_from_cusps(
+        [p["longitude"] for p in planets],
+        sripati_sandhis[-1:] + sripati_sandhis[:-1]
+    )
+    bhav_chalit_planets = [
+        {"planet": p["planet"], "house": planet_house}
+        for p, planet_house in zip(planets, bhav_chalit_houses)
+    ]
     
     # Build chart data structures
     ascendant_data = {
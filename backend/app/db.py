@@ -10,12 +10,105 @@ SECURITY NOTES:
 - Profile operations verify user ownership
 """
 
-from flask import current_app
-from sqlalchemy.exc import SQLAlchemyError
-from .models import db
+import os
+import random
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+import orjson
+from flask import current_app, g, jsonify
+from sqlalchemy import REAL, Text, and_, cast, func
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy.orm import selectinload
+from .models import db, User, ApprovedUser, Profile, Chart, AnalysisNote
+from .chart_calc import calculate_chart_for_profile
 
 
-CURRENT_CHART_SCHEMA_VERSION = 3
+# Bump whenever calculated chart output changes, so stored charts are recalculated
+# (v4: cusp-based houses wrap correctly past 360°)
+CURRENT_CHART_SCHEMA_VERSION = 4
+
+# Minimum seconds between last_login_at writes for the same user
+# (avoids an UPDATE + commit on every login from chatty clients)
+LAST_LOGIN_UPDATE_INTERVAL_SECONDS = 60
+
+# Fraction of database errors in auth checks that are logged with a full
+# traceback. During an outage every request fails the same way, so one
+# stack trace in twenty is plenty and the rest log class + message only.
+EXC_INFO_SAMPLE_RATE = 0.05
+
+# Connections opened per gunicorn worker by warm_pool (kept <= pool_size)
+DB_POOL_WARMUP_CONNECTIONS = 3
+
+# update_profile: map camelCase frontend keys to snake_case database keys
+PROFILE_FIELD_MAPPING = {
+    'name': 'name',
+    'datetime': 'datetime',
+    'tz': 'tz',
+    'utcOffsetMinutes': 'utc_offset_minutes',
+    'latitude': 'latitude',
+    'longitude': 'longitude',
+    'houseSystem': 'house_system',
+    'ayanamsha': 'ayanamsha',
+    'nodeType': 'node_type'
+}
+
+# Optional profile fields the frontend may clear by sending null
+PROFILE_NULLABLE_FIELDS = frozenset({'name', 'tz', 'utcOffsetMinutes'})
+
+# Chart-affecting fields (if any of these change, the cached chart is recalculated)
+CHART_AFFECTING_FIELDS = frozenset({'datetime', 'latitude', 'longitude', 'house_system', 'ayanamsha', 'node_type'})
+
+
+# orjson options for JSON/JSONB columns: non-string dict keys are coerced like
+# the stdlib json module does, numpy scalars/arrays serialize natively
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _json_dumps(obj):
+    """orjson-backed serializer for JSON columns (SQLAlchemy expects str)."""
+    return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+
+
+def _utcnow():
+    """Current UTC time as a naive datetime (columns are TIMESTAMP without time zone)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# In-process chart cache (per worker), keyed by profile_id
+# Entries are tagged with the profile's updated_at: any profile edit (the only
+# way a chart's inputs change) bumps updated_at, so a stale entry in another
+# worker simply misses. Set CHART_CACHE_SIZE=0 to disable.
+CHART_CACHE_SIZE = int(os.environ.get("CHART_CACHE_SIZE", "128"))
+_chart_cache = OrderedDict()
+_chart_cache_lock = threading.Lock()
+
+
+def _chart_cache_get(profile_id, profile_updated_at):
+    """Return the cached (chart_id, chart_json) for a cache hit, or None."""
+    with _chart_cache_lock:
+        entry = _chart_cache.get(profile_id)
+        if entry is None or entry[0] != profile_updated_at:
+            return None
+        _chart_cache.move_to_end(profile_id)
+        return entry[1]
+
+
+def _chart_cache_put(profile_id, profile_updated_at, cached):
+    """Store a (chart_id, chart_json) pair, evicting the least recently used entry."""
+    with _chart_cache_lock:
+        _chart_cache[profile_id] = (profile_updated_at, cached)
+        _chart_cache.move_to_end(profile_id)
+        while len(_chart_cache) > CHART_CACHE_SIZE:
+            _chart_cache.popitem(last=False)
+
+
+def _chart_cache_invalidate(profile_id):
+    """Drop any cached chart for the profile (this worker only)."""
+    with _chart_cache_lock:
+        _chart_cache.pop(profile_id, None)
 
 
 def init_db(app):
@@ -41,6 +134,10 @@ def init_db(app):
         "pool_timeout": 30,        # Seconds to wait before timing out connection request
         "pool_recycle": 3600,      # Recycle connections after 1 hour (prevents stale connections)
         "pool_pre_ping": True,     # Validate connections before using them
+        # Chart payloads are large JSONB documents: encode/decode them with orjson
+        # (the deserializer is registered with psycopg2 for json and jsonb)
+        "json_serializer": _json_dumps,
+        "json_deserializer": orjson.loads,
     }
     
     # Initialize SQLAlchemy with app
@@ -56,6 +153,40 @@ def init_db(app):
         app.logger.warning("DATABASE_URL not configured or in unexpected format")
 
 
+def warm_pool(app):
+    """
+    Open DB_POOL_WARMUP_CONNECTIONS pooled connections up front so the first
+    requests don't pay the connect + TLS handshake cost.
+    
+    Called from gunicorn's post_worker_init hook, i.e. in each worker after
+    the fork: with preload_app the master never opens connections, so
+    workers don't inherit (or share) its sockets.
+    
+    Connections are held simultaneously and then returned together; checking
+    one out and back in a loop would just reuse the same connection.
+    
+    NOTES:
+    - No-op when DB_POOL_WARMUP=false or the database isn't initialized
+    - Failures are logged and ignored (worker still starts without a database)
+    """
+    if os.environ.get("DB_POOL_WARMUP", "true").lower() != "true":
+        return
+    if "sqlalchemy" not in getattr(app, "extensions", {}):
+        return
+    
+    connections = []
+    try:
+        with app.app_context():
+            for _ in range(DB_POOL_WARMUP_CONNECTIONS):
+                connections.append(db.engine.connect())
+            app.logger.info(f"Database pool warmed with {len(connections)} connection(s)")
+    except SQLAlchemyError as e:
+        app.logger.warning(f"Database pool warm-up failed: {str(e)}")
+    finally:
+        for conn in connections:
+            conn.close()
+
+
 def set_rls_user_id(user_id):
     """
     Set the current user ID for Row Level Security (RLS) policies.
@@ -130,21 +261,28 @@ def get_or_create_user(google_sub, email, name):
         
     SECURITY NOTES:
     - Uses google_sub as primary identifier (reliable even if email changes)
-    - Updates last_login_at on every call
+    - Updates last_login_at at most once per LAST_LOGIN_UPDATE_INTERVAL_SECONDS
+    - Only commits when something actually changed
     - Wrapped in transaction for atomicity
     """
-    from .models import User
-    from datetime import datetime
-    
     try:
-        # Try to find existing user by google_sub
-        user = User.query.filter_by(google_sub=google_sub).first()
+        # Try to find existing user by google_sub (unique column)
+        user = db.session.execute(
+            db.select(User).where(User.google_sub == google_sub)
+        ).scalar_one_or_none()
         
         if user:
-            # Update existing user
-            user.email = email  # Update in case email changed
-            user.name = name    # Update in case name changed
-            user.last_login_at = datetime.utcnow()
+            # Update existing user (only touch attributes that changed)
+            if user.email != email:
+                user.email = email  # Email changed
+            if user.name != name:
+                user.name = name    # Name changed
+            now = _utcnow()
+            if (
+                user.last_login_at is None
+                or (now - user.last_login_at).total_seconds() > LAST_LOGIN_UPDATE_INTERVAL_SECONDS
+            ):
+                user.last_login_at = now
             current_app.logger.info(f"Existing user logged in: {google_sub[:12]}...")
         else:
             # Create new user
@@ -152,14 +290,15 @@ def get_or_create_user(google_sub, email, name):
                 google_sub=google_sub,
                 email=email,
                 name=name,
-                last_login_at=datetime.utcnow()
+                last_login_at=_utcnow()
             )
             db.session.add(user)
             email_domain = email.split("@")[1] if "@" in email else "unknown"
             current_app.logger.info(f"New user created from domain: {email_domain}")
         
-        # Commit transaction
-        db.session.commit()
+        # Commit transaction (skip the write entirely if nothing changed)
+        if user in db.session.new or db.session.is_modified(user):
+            db.session.commit()
         return user
         
     except SQLAlchemyError as e:
@@ -186,8 +325,33 @@ def is_email_approved(email):
     SECURITY NOTES:
     - Case-sensitive email matching (matches Google OAuth exactly)
     - Must check is_active flag (not just presence in table)
+    - Malformed/empty emails are rejected before touching the database
+    - Memoized on flask.g for the current request only (see _auth_memo)
     """
-    from .models import ApprovedUser
+    return _auth_memo(("email", email), _check_email_approved, email)
+
+
+def _auth_memo(key, check, *args):
+    """
+    Memoize an authorization check on flask.g for the current request.
+    
+    A request that re-verifies (e.g. OAuth callback, or a helper calling back
+    into the same check) reuses the first answer instead of re-querying.
+    g is torn down with the app context, so an answer never outlives the
+    request and a deactivation takes effect on the very next one.
+    """
+    auth_cache = g.setdefault("_auth_cache", {})
+    if key not in auth_cache:
+        auth_cache[key] = check(*args)
+    return auth_cache[key]
+
+
+def _check_email_approved(email):
+    """Uncached body of is_email_approved()."""
+    # Fail fast: never spend a pool checkout on an email that can't match
+    if not email or "@" not in email:
+        current_app.logger.warning("Authorization denied: missing or malformed email")
+        return False
     
     try:
         # Log the email domain being checked (for debugging)
@@ -199,22 +363,20 @@ def is_email_approved(email):
             current_app.logger.error("Database not initialized - SQLAlchemy extension not found")
             return False
         
-        # Query the database
-        approved_user = ApprovedUser.query.filter_by(email=email).first()
+        # Query the database (2.0-style select hits the compiled statement cache)
+        approved_active = db.session.execute(
+            db.select(ApprovedUser.is_active).where(ApprovedUser.email == email)
+        ).scalar_one_or_none()
         
-        if not approved_user:
+        if approved_active is None:
             current_app.logger.warning(f"Authorization denied: domain not in allowlist: {email_domain}")
-            # Debug: List count of approved users (for troubleshooting)
-            try:
-                approved_count = ApprovedUser.query.filter_by(is_active=True).count()
-                current_app.logger.debug(f"Active approved users in database: {approved_count}")
-            except Exception as debug_e:
-                current_app.logger.debug(f"Could not count approved users: {str(debug_e)}")
+            # No diagnostic COUNT(*) here: the denial path is reachable by any
+            # unauthenticated caller, so it must not cost a table scan.
             return False
         
-        current_app.logger.info(f"Found approved_user for domain: {email_domain}, is_active={approved_user.is_active}")
+        current_app.logger.info(f"Found approved_user for domain: {email_domain}, is_active={approved_active}")
         
-        if not approved_user.is_active:
+        if not approved_active:
             current_app.logger.warning(f"Authorization denied: user in allowlist but not active (domain: {email_domain})")
             return False
         
@@ -222,7 +384,10 @@ def is_email_approved(email):
         return True
         
     except SQLAlchemyError as e:
-        current_app.logger.error(f"Database error in is_email_approved: {str(e)}", exc_info=True)
+        current_app.logger.error(
+            f"Database error in is_email_approved: {type(e).__name__}: {str(e)}",
+            exc_info=random.random() < EXC_INFO_SAMPLE_RATE
+        )
         # Fail closed: deny access on database error
         return False
     except Exception as e:
@@ -246,18 +411,33 @@ def is_user_authorized(google_sub, email):
         email: User's email from session
         
     Returns:
-        tuple: (authorized: bool, user: User or None)
+        tuple: (authorized: bool, user: Row or None)
+        The user is a lightweight Row exposing id, email and is_active
+        (not a full User instance) since callers only need the user ID.
         
     SECURITY NOTES:
     - Checks BOTH tables' is_active flags (defense in depth)
     - Returns generic False for all failure modes (don't leak which check failed)
     - Used on every protected request
+    - Empty google_sub or malformed email is rejected before touching the database
+    - Memoized on flask.g for the current request only (see _auth_memo)
     """
-    from .models import User, ApprovedUser
+    return _auth_memo(("user", google_sub, email), _check_user_authorized, google_sub, email)
+
+
+def _check_user_authorized(google_sub, email):
+    """Uncached body of is_user_authorized()."""
+    # Fail fast: never spend a pool checkout on identifiers that can't match
+    if not google_sub or not email or "@" not in email:
+        current_app.logger.warning("Authorization denied: missing google_sub or malformed email")
+        return False, None
     
     try:
-        # Check 1: User exists and is active
-        user = User.query.filter_by(google_sub=google_sub).first()
+        # Check 1: User exists and is active (google_sub is unique)
+        # Select only the columns we need - skips ORM instance construction
+        user = db.session.execute(
+            db.select(User.id, User.email, User.is_active).where(User.google_sub == google_sub)
+        ).one_or_none()
         
         if not user:
             current_app.logger.warning(f"Authorization denied: user not found: google_sub={google_sub}")
@@ -267,15 +447,17 @@ def is_user_authorized(google_sub, email):
             current_app.logger.warning(f"Authorization denied: user not active (google_sub: {google_sub[:12]}...)")
             return False, None
         
-        # Check 2: Email is approved and active
-        approved_user = ApprovedUser.query.filter_by(email=email).first()
+        # Check 2: Email is approved and active (primary key lookup)
+        approved_active = db.session.execute(
+            db.select(ApprovedUser.is_active).where(ApprovedUser.email == email)
+        ).scalar_one_or_none()
         email_domain = email.split("@")[1] if "@" in email else "unknown"
         
-        if not approved_user:
+        if approved_active is None:
             current_app.logger.warning(f"Authorization denied: domain not in allowlist: {email_domain}")
             return False, None
         
-        if not approved_user.is_active:
+        if not approved_active:
             current_app.logger.warning(f"Authorization denied: user in allowlist but not active (domain: {email_domain})")
             return False, None
         
@@ -319,46 +501,27 @@ def get_or_create_profile(user_id, birth_details, chart_settings, name=None):
     SECURITY NOTES:
     - user_id must come from authenticated session (never from request)
     - Unique constraint prevents duplicate profiles
-    - Wrapped in transaction for atomicity
-    - Handles floating-point precision issues with lat/lng
-    """
-    from .models import Profile
-    from sqlalchemy.exc import IntegrityError
-    from sqlalchemy import and_, func
+    - INSERT ... ON CONFLICT (no SELECT-then-INSERT race); the fallback
+      SELECT only reads a row the conflict proved exists
     
+    NOTES:
+    - Lat/lng are rounded to 4 decimals before insert; PostgreSQL casts them
+      to the column type before the conflict check, so the same input always
+      lands on the same row regardless of float precision
+    - On conflict, the row is only updated (name + updated_at) when a
+      non-empty, different name is given; reusing a profile as-is is a
+      read, with no row write or lock
+    """
     # Round lat/lng to match PostgreSQL REAL precision (4 decimal places is safe)
     # This prevents precision mismatches between Python floats and database storage
     lat_rounded = round(birth_details['latitude'], 4)
     lng_rounded = round(birth_details['longitude'], 4)
     
     try:
-        # Try to find existing profile using range query for lat/lng to handle precision
-        # Use a small tolerance (0.0001 degrees ≈ 11 meters) for floating-point comparison
-        tolerance = 0.0001
-        profile = Profile.query.filter(
-            and_(
-                Profile.user_id == user_id,
-                Profile.datetime == birth_details['datetime'],
-                Profile.latitude.between(lat_rounded - tolerance, lat_rounded + tolerance),
-                Profile.longitude.between(lng_rounded - tolerance, lng_rounded + tolerance),
-                Profile.house_system == chart_settings['house_system'],
-                Profile.ayanamsha == chart_settings['ayanamsha'],
-                Profile.node_type == chart_settings['node_type']
-            )
-        ).first()
-        
-        if profile:
-            current_app.logger.info(f"Reusing existing profile: {profile.id}")
-            # Update name if provided and different
-            if name and profile.name != name:
-                profile.name = name
-                db.session.commit()
-            return profile
-        
-        # Create new profile with rounded coordinates
-        profile = Profile(
+        now = _utcnow()
+        stmt = pg_insert(Profile).values(
             user_id=user_id,
-            name=name,
+            name=name or None,
             datetime=birth_details['datetime'],
             tz=birth_details.get('tz'),
             utc_offset_minutes=birth_details.get('utc_offset_minutes'),
@@ -369,69 +532,40 @@ def get_or_create_profile(user_id, birth_details, chart_settings, name=None):
             node_type=chart_settings['node_type']
         )
         
-        db.session.add(profile)
+        # Existing rows are only written when a new non-empty name is given;
+        # otherwise the WHERE skips the update and RETURNING yields no row
+        stmt = stmt.on_conflict_do_update(
+            constraint='uq_user_profile',
+            set_={'name': stmt.excluded.name, 'updated_at': now},
+            where=and_(
+                stmt.excluded.name.isnot(None),
+                stmt.excluded.name.is_distinct_from(Profile.name)
+            )
+        ).returning(Profile)
         
-        try:
-            db.session.commit()
-            current_app.logger.info(f"Created new profile: {profile.id} for user: {user_id}")
-            return profile
-        except IntegrityError as ie:
-            # Race condition or precision issue: profile exists but our query missed it
-            db.session.rollback()
-            current_app.logger.info(f"Profile already exists (caught by unique constraint), fetching existing profile")
-            
-            # Query again with broader range to catch any precision variations
-            profile = Profile.query.filter(
-                and_(
+        profile = db.session.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).one_or_none()
+        
+        if profile is None:
+            # Unchanged existing profile: read it by the uq_user_profile key
+            # (lat/lng as REAL, the column type, so the rounded value matches)
+            profile = db.session.scalars(
+                db.select(Profile).where(
                     Profile.user_id == user_id,
                     Profile.datetime == birth_details['datetime'],
-                    Profile.latitude.between(lat_rounded - tolerance, lat_rounded + tolerance),
-                    Profile.longitude.between(lng_rounded - tolerance, lng_rounded + tolerance),
+                    Profile.latitude == cast(lat_rounded, REAL),
+                    Profile.longitude == cast(lng_rounded, REAL),
                     Profile.house_system == chart_settings['house_system'],
                     Profile.ayanamsha == chart_settings['ayanamsha'],
                     Profile.node_type == chart_settings['node_type']
                 )
-            ).first()
-            
-            if profile:
-                current_app.logger.info(f"Retrieved existing profile after IntegrityError: {profile.id}")
-                # Update name if provided and different
-                if name and profile.name != name:
-                    profile.name = name
-                    db.session.commit()
-                return profile
-            else:
-                # Last resort: query by all other fields and pick the closest lat/lng match
-                # This handles extreme precision edge cases
-                current_app.logger.warning(f"Could not find profile with tolerance, trying broader search")
-                candidates = Profile.query.filter_by(
-                    user_id=user_id,
-                    datetime=birth_details['datetime'],
-                    house_system=chart_settings['house_system'],
-                    ayanamsha=chart_settings['ayanamsha'],
-                    node_type=chart_settings['node_type']
-                ).all()
-                
-                # Find closest match by lat/lng
-                for candidate in candidates:
-                    lat_diff = abs(candidate.latitude - lat_rounded)
-                    lng_diff = abs(candidate.longitude - lng_rounded)
-                    if lat_diff < 0.001 and lng_diff < 0.001:  # Within ~100 meters
-                        current_app.logger.info(f"Found matching profile via broader search: {candidate.id}")
-                        if name and candidate.name != name:
-                            candidate.name = name
-                            db.session.commit()
-                        return candidate
-                
-                # Still couldn't find it - this shouldn't happen
-                current_app.logger.error(f"IntegrityError occurred but could not find existing profile: {str(ie)}")
-                raise
-        
-    except IntegrityError as e:
-        # This should have been caught above, but just in case
-        db.session.rollback()
-        current_app.logger.error(f"IntegrityError in get_or_create_profile: {str(e)}")
-        raise
+            ).one()
+        db.session.commit()
+        
+        current_app.logger.info(f"Upserted profile: {profile.id} for user: {user_id}")
+        return profile
+        
     except SQLAlchemyError as e:
         db.session.rollback()
         current_app.logger.error(f"Database error in get_or_create_profile: {str(e)}")
@@ -457,17 +591,16 @@ def get_user_profile(profile_id, user_id):
         - On unauthorized: (None, (error_dict, 403))
         
     SECURITY NOTES:
-    - Always verifies profile.user_id == user_id
+    - Always verifies profile.user_id == user_id (as UUID values)
     - Returns 403 if user doesn't own profile
     - Returns 404 if profile doesn't exist
     - Generic error messages (don't leak existence)
     """
-    from .models import Profile
-    from flask import jsonify
-    
     try:
         # Load profile by ID
-        profile = Profile.query.filter_by(id=profile_id, is_active=True).first()
+        profile = db.session.execute(
+            db.select(Profile).where(Profile.id == profile_id, Profile.is_active == True)
+        ).scalar_one_or_none()
         
         if not profile:
             current_app.logger.warning(f"Profile not found: {profile_id}")
@@ -479,7 +612,9 @@ def get_user_profile(profile_id, user_id):
             }), 404)
         
         # Verify ownership
-        if str(profile.user_id) != str(user_id):
+        # Compare UUIDs directly (int compare); coerce only if given a string
+        owner_id = user_id if isinstance(user_id, uuid.UUID) else uuid.UUID(str(user_id))
+        if profile.user_id != owner_id:
             current_app.logger.warning(
                 f"Unauthorized profile access attempt: profile={profile_id}, "
                 f"owner={profile.user_id}, requester={user_id}"
@@ -512,33 +647,62 @@ def get_user_profile(profile_id, user_id):
         }), 500)
 
 
-def get_cached_chart(profile_id):
+def get_cached_chart_json(profile_id, profile_updated_at=None):
     """
-    Retrieve cached chart for the given profile.
+    Retrieve the cached chart for the given profile as serialized JSON.
     
     Args:
         profile_id: UUID of the profile
+        profile_updated_at: The profile's updated_at; when given, the in-process
+                            chart cache is consulted before PostgreSQL
         
     Returns:
-        Chart: Chart model instance or None if not cached
+        tuple: (chart_id, chart_json) or None if not cached. chart_json is the
+               UTF-8 bytes of a JSON object with the response keys metadata,
+               ascendant, planets and bhavChalit
         
     NOTES:
     - Returns None if chart doesn't exist (not an error)
     - Caller should recalculate and save if None
+    - The JSONB columns are read as PostgreSQL's own text output, so a cache
+      hit never parses the chart into Python objects or re-serializes it
     """
-    from .models import Chart
+    use_memory_cache = CHART_CACHE_SIZE > 0 and profile_updated_at is not None
     
     try:
-        chart = Chart.query.filter_by(profile_id=profile_id).first()
-        
-        if chart:
-            if chart.schema_version == CURRENT_CHART_SCHEMA_VERSION:
+        if use_memory_cache:
+            cached = _chart_cache_get(profile_id, profile_updated_at)
+            if cached is not None:
+                current_app.logger.info(f"Memory cache hit: chart for profile {profile_id}")
+                return cached
+        
+        row = db.session.execute(
+            db.select(
+                Chart.id,
+                Chart.schema_version,
+                cast(Chart.chart_metadata, Text),
+                cast(Chart.ascendant_data, Text),
+                cast(Chart.planets_data, Text),
+                cast(Chart.bhav_chalit_data, Text),
+            ).where(Chart.profile_id == profile_id)
+        ).one_or_none()
+        
+        if row:
+            chart_id, schema_version, metadata, ascendant, planets, bhav_chalit = row
+            if schema_version == CURRENT_CHART_SCHEMA_VERSION:
                 current_app.logger.info(
-                    f"Cache hit: chart v{chart.schema_version} for profile {profile_id}"
+                    f"Cache hit: chart v{schema_version} for profile {profile_id}"
                 )
-                return chart
+                chart_json = (
+                    f'{{"metadata":{metadata},"ascendant":{ascendant},'
+                    f'"planets":{planets},"bhavChalit":{bhav_chalit}}}'
+                ).encode("utf-8")
+                cached = (chart_id, chart_json)
+                if use_memory_cache:
+                    _chart_cache_put(profile_id, profile_updated_at, cached)
+                return cached
             current_app.logger.info(
-                f"Cache stale (v{chart.schema_version} → v{CURRENT_CHART_SCHEMA_VERSION}) "
+                f"Cache stale (v{schema_version} → v{CURRENT_CHART_SCHEMA_VERSION}) "
                 f"for profile {profile_id} - will recalculate"
             )
         else:
@@ -547,11 +711,11 @@ def get_cached_chart(profile_id):
         return None
         
     except SQLAlchemyError as e:
-        current_app.logger.error(f"Database error in get_cached_chart: {str(e)}")
+        current_app.logger.error(f"Database error in get_cached_chart_json: {str(e)}")
         # Return None on error (caller will recalculate)
         return None
     except Exception as e:
-        current_app.logger.error(f"Unexpected error in get_cached_chart: {str(e)}")
+        current_app.logger.error(f"Unexpected error in get_cached_chart_json: {str(e)}")
         return None
 
 
@@ -572,72 +736,41 @@ def save_chart(profile_id, chart_data):
         SQLAlchemyError: On database errors
         
     NOTES:
-    - Uses upsert pattern (create or update)
-    - Wrapped in transaction for atomicity
-    - Handles race conditions when multiple requests try to create chart simultaneously
+    - Single INSERT ... ON CONFLICT (profile_id) DO UPDATE statement
+    - Concurrent saves for the same profile resolve in the database (last write wins)
+    - Updating in place preserves chart.id, so analysis notes stay attached
     """
-    from .models import Chart
-    from sqlalchemy.exc import IntegrityError
-    
     try:
-        # Check if chart already exists
-        chart = Chart.query.filter_by(profile_id=profile_id).first()
-        
-        if chart:
-            # Update existing chart
-            chart.ascendant_data = chart_data['ascendant']
-            chart.planets_data = chart_data['planets']
-            chart.house_cusps = chart_data.get('houseCusps')
-            chart.bhav_chalit_data = chart_data['bhavChalit']
-            chart.chart_metadata = chart_data['metadata']
-            chart.schema_version = CURRENT_CHART_SCHEMA_VERSION
-            current_app.logger.info(f"Updated cached chart for profile: {profile_id}")
-        else:
-            # Create new chart
-            chart = Chart(
-                profile_id=profile_id,
-                ascendant_data=chart_data['ascendant'],
-                planets_data=chart_data['planets'],
-                house_cusps=chart_data.get('houseCusps'),
-                bhav_chalit_data=chart_data['bhavChalit'],
-                chart_metadata=chart_data['metadata'],
-                schema_version=CURRENT_CHART_SCHEMA_VERSION,
-            )
-            db.session.add(chart)
-            current_app.logger.info(f"Created new cached chart for profile: {profile_id}")
+        stmt = pg_insert(Chart).values(
+            profile_id=profile_id,
+            ascendant_data=chart_data['ascendant'],
+            planets_data=chart_data['planets'],
+            house_cusps=chart_data.get('houseCusps'),
+            bhav_chalit_data=chart_data['bhavChalit'],
+            chart_metadata=chart_data['metadata'],
+            schema_version=CURRENT_CHART_SCHEMA_VERSION,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Chart.profile_id],
+            set_={
+                'ascendant_data': stmt.excluded.ascendant_data,
+                'planets_data': stmt.excluded.planets_data,
+                'house_cusps': stmt.excluded.house_cusps,
+                'bhav_chalit_data': stmt.excluded.bhav_chalit_data,
+                'chart_metadata': stmt.excluded.chart_metadata,
+                'schema_version': stmt.excluded.schema_version,
+            }
+        ).returning(Chart)
+        
+        chart = db.session.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).one()
+        db.session.commit()
+        _chart_cache_invalidate(profile_id)
+        
+        current_app.logger.info(f"Saved cached chart for profile: {profile_id}")
+        return chart
         
-        try:
-            db.session.commit()
-            return chart
-        except IntegrityError as ie:
-            # Race condition: another request created the chart between our check and insert
-            db.session.rollback()
-            current_app.logger.info(f"Chart already exists (caught by unique constraint), fetching existing chart for profile: {profile_id}")
-            
-            # Re-query to get the chart that was just created by the concurrent request
-            chart = Chart.query.filter_by(profile_id=profile_id).first()
-            
-            if chart:
-                # Update the existing chart with our calculated data
-                chart.ascendant_data = chart_data['ascendant']
-                chart.planets_data = chart_data['planets']
-                chart.house_cusps = chart_data.get('houseCusps')
-                chart.bhav_chalit_data = chart_data['bhavChalit']
-                chart.chart_metadata = chart_data['metadata']
-                chart.schema_version = CURRENT_CHART_SCHEMA_VERSION
-                db.session.commit()
-                current_app.logger.info(f"Retrieved and updated existing chart after IntegrityError: {chart.id}")
-                return chart
-            else:
-                # This shouldn't happen - chart should exist if we got IntegrityError
-                current_app.logger.error(f"IntegrityError occurred but could not find existing chart for profile: {profile_id}")
-                raise
-        
-    except IntegrityError as e:
-        # This should have been caught above, but just in case
-        db.session.rollback()
-        current_app.logger.error(f"IntegrityError in save_chart: {str(e)}")
-        raise
     except SQLAlchemyError as e:
         db.session.rollback()
         current_app.logger.error(f"Database error in save_chart: {str(e)}")
@@ -663,16 +796,17 @@ def get_user_profiles(user_id, limit=100):
     - Only returns active profiles (is_active=True)
     - Ordered by updated_at descending (most recently updated first)
     - Limited to prevent excessive data transfer
+    - Eager-loads profile.chart (id only) in one extra query, so the profile
+      list doesn't lazy-load each chart's JSON payload one by one
     """
-    from .models import Profile
-    
     try:
-        profiles = Profile.query.filter_by(
-            user_id=user_id,
-            is_active=True
-        ).order_by(
-            Profile.updated_at.desc()
-        ).limit(limit).all()
+        profiles = db.session.execute(
+            db.select(Profile)
+            .options(selectinload(Profile.chart).load_only(Chart.id, Chart.profile_id))
+            .where(Profile.user_id == user_id, Profile.is_active == True)
+            .order_by(Profile.updated_at.desc())
+            .limit(limit)
+        ).scalars().all()
         
         current_app.logger.info(f"Retrieved {len(profiles)} profiles for user: {user_id}")
         return profiles
@@ -706,34 +840,13 @@ def update_profile(profile_id, user_id, updates):
     SECURITY NOTES:
     - Verifies profile ownership before updating
     - Rounds coordinates to 4 decimal places for precision
-    - Checks unique constraint before committing
+    - Duplicates are rejected by the uq_user_profile constraint at flush time
     - Invalidates chart cache if chart-affecting fields change
     - Wrapped in transaction for atomicity
     
     Chart-affecting fields (will invalidate cache):
     - datetime, latitude, longitude, house_system, ayanamsha, node_type
     """
-    from .models import Profile, Chart
-    from sqlalchemy.exc import IntegrityError
-    from sqlalchemy import and_
-    from flask import jsonify
-    
-    # Map camelCase frontend keys to snake_case database keys
-    field_mapping = {
-        'name': 'name',
-        'datetime': 'datetime',
-        'tz': 'tz',
-        'utcOffsetMinutes': 'utc_offset_minutes',
-        'latitude': 'latitude',
-        'longitude': 'longitude',
-        'houseSystem': 'house_system',
-        'ayanamsha': 'ayanamsha',
-        'nodeType': 'node_type'
-    }
-    
-    # Chart-affecting fields (if any of these change, invalidate cache)
-    chart_affecting_fields = {'datetime', 'latitude', 'longitude', 'house_system', 'ayanamsha', 'node_type'}
-    
     try:
         # Step 1: Verify ownership
         profile, error_response = get_user_profile(profile_id, user_id)
@@ -752,59 +865,39 @@ def update_profile(profile_id, user_id, updates):
         for frontend_key, value in updates.items():
             if value is None:  # Skip None values (frontend can send null to clear optional fields)
                 # Only allow None for optional fields
-                if frontend_key in ['name', 'tz', 'utcOffsetMinutes']:
-                    db_key = field_mapping[frontend_key]
+                if frontend_key in PROFILE_NULLABLE_FIELDS:
+                    db_key = PROFILE_FIELD_MAPPING[frontend_key]
                     db_updates[db_key] = None
                 continue
             
-            db_key = field_mapping.get(frontend_key)
+            db_key = PROFILE_FIELD_MAPPING.get(frontend_key)
             if db_key is None:
                 current_app.logger.warning(f"Unknown update field: {frontend_key}")
                 continue
             
             # Round coordinates to 4 decimal places
-            if db_key in ['latitude', 'longitude']:
+            if db_key in ('latitude', 'longitude'):
                 value = round(float(value), 4)
             
             db_updates[db_key] = value
             
             # Track if chart cache needs invalidation
-            if db_key in chart_affecting_fields:
+            if db_key in CHART_AFFECTING_FIELDS:
                 chart_invalidation_needed = True
         
-        # Step 4: Check unique constraint before updating
-        # Build the "new" profile values (current + updates)
-        new_datetime = db_updates.get('datetime', profile.datetime)
-        new_latitude = db_updates.get('latitude', profile.latitude)
-        new_longitude = db_updates.get('longitude', profile.longitude)
-        new_house_system = db_updates.get('house_system', profile.house_system)
-        new_ayanamsha = db_updates.get('ayanamsha', profile.ayanamsha)
-        new_node_type = db_updates.get('node_type', profile.node_type)
-        
-        # Round lat/lng for comparison
-        lat_rounded = round(new_latitude, 4)
-        lng_rounded = round(new_longitude, 4)
-        
-        # Check if another profile exists with same unique constraint values
-        # Use tolerance-based comparison for lat/lng (0.0001 degrees ≈ 11 meters)
-        tolerance = 0.0001
-        conflicting_profile = Profile.query.filter(
-            and_(
-                Profile.user_id == user_id,
-                Profile.id != profile_id,  # Exclude current profile
-                Profile.datetime == new_datetime,
-                Profile.latitude.between(lat_rounded - tolerance, lat_rounded + tolerance),
-                Profile.longitude.between(lng_rounded - tolerance, lng_rounded + tolerance),
-                Profile.house_system == new_house_system,
-                Profile.ayanamsha == new_ayanamsha,
-                Profile.node_type == new_node_type
-            )
-        ).first()
+        # Step 4: Apply updates to profile object
+        for db_key, value in db_updates.items():
+            setattr(profile, db_key, value)
         
-        if conflicting_profile:
+        # Step 5: Flush so uq_user_profile rejects duplicates up front
+        # (no separate conflict SELECT, and no chart recalculation for a doomed update)
+        try:
+            db.session.flush()
+        except IntegrityError as ie:
+            db.session.rollback()
             current_app.logger.warning(
                 f"Unique constraint violation: profile update would create duplicate "
-                f"profile_id={profile_id}, conflicting_id={conflicting_profile.id}"
+                f"profile_id={profile_id}: {str(ie)}"
             )
             return None, (jsonify({
                 "error": {
@@ -813,22 +906,17 @@ def update_profile(profile_id, user_id, updates):
                 }
             }), 409)
         
-        # Step 5: Apply updates to profile object
-        for db_key, value in db_updates.items():
-            setattr(profile, db_key, value)
-        
         # Step 6: Recalculate chart if chart-affecting fields changed
         # Instead of deleting the chart, we recalculate and update it in place.
         # This preserves the chart_id and prevents analysis notes from being cascade-deleted.
         if chart_invalidation_needed:
-            chart = Chart.query.filter_by(profile_id=profile_id).first()
-            if chart:
+            chart_id = db.session.execute(
+                db.select(Chart.id).where(Chart.profile_id == profile_id)
+            ).scalar()
+            if chart_id is not None:
                 try:
-                    # Import here to avoid circular dependency
-                    from .chart_calc import calculate_chart_for_profile
-                    
                     # Recalculate chart with updated profile data
-                    # Note: profile object in memory already has the new values (applied in Step 5)
+                    # Note: profile object in memory already has the new values (applied in Step 4)
                     chart_data = calculate_chart_for_profile(profile)
                     
                     # Update chart in place (preserves chart_id and notes)
@@ -841,20 +929,9 @@ def update_profile(profile_id, user_id, updates):
                     current_app.logger.info(f"Profile update will proceed; chart will be recalculated on next view")
         
         # Step 7: Commit transaction
-        try:
-            db.session.commit()
-            current_app.logger.info(f"Profile updated: {profile_id} for user: {user_id}")
-            return profile, None
-        except IntegrityError as ie:
-            # Race condition: another request created duplicate profile
-            db.session.rollback()
-            current_app.logger.warning(f"IntegrityError on profile update (race condition): {str(ie)}")
-            return None, (jsonify({
-                "error": {
-                    "code": "DUPLICATE_PROFILE",
-                    "message": "A profile with these details already exists"
-                }
-            }), 409)
+        db.session.commit()
+        current_app.logger.info(f"Profile updated: {profile_id} for user: {user_id}")
+        return profile, None
         
     except SQLAlchemyError as e:
         db.session.rollback()
@@ -890,27 +967,31 @@ def delete_profile(profile_id, user_id):
         - On error: (False, (error_dict, status_code))
         
     SECURITY NOTES:
-    - Verifies profile ownership before deletion
+    - Ownership is part of the DELETE's WHERE clause (atomic check + delete)
     - Charts automatically deleted via CASCADE constraint
     - Wrapped in transaction for atomicity
     - Generic error messages (don't leak existence)
     """
-    from .models import Profile
-    from flask import jsonify
-    
     try:
-        # Step 1: Verify ownership
-        profile, error_response = get_user_profile(profile_id, user_id)
-        if error_response:
-            # Return (False, error_response) to indicate failure
-            return False, error_response
-        
-        # Step 2: Delete profile (hard delete)
+        # Step 1: Delete profile (hard delete) only if owned by this user
         # Charts will be automatically deleted via CASCADE constraint
-        db.session.delete(profile)
+        deleted_id = db.session.execute(
+            db.delete(Profile).where(
+                Profile.id == profile_id,
+                Profile.user_id == user_id,
+                Profile.is_active == True
+            ).returning(Profile.id)
+        ).scalar_one_or_none()
         
-        # Step 3: Commit transaction
+        if deleted_id is None:
+            # Nothing deleted: resolve 404 vs 403 the same way as other profile routes
+            db.session.rollback()
+            _, error_response = get_user_profile(profile_id, user_id)
+            return False, error_response
+        
+        # Step 2: Commit transaction
         db.session.commit()
+        _chart_cache_invalidate(deleted_id)
         
         current_app.logger.info(f"Profile deleted: {profile_id} for user: {user_id}")
         return True, None
@@ -952,12 +1033,12 @@ def get_notes_for_chart(chart_id):
     Raises:
         SQLAlchemyError: If database query fails
     """
-    from .models import AnalysisNote
-    
     try:
-        notes = AnalysisNote.query.filter_by(chart_id=chart_id)\
-            .order_by(AnalysisNote.updated_at.desc())\
-            .all()
+        notes = db.session.execute(
+            db.select(AnalysisNote)
+            .where(AnalysisNote.chart_id == chart_id)
+            .order_by(AnalysisNote.updated_at.desc())
+        ).scalars().all()
         return notes
     except SQLAlchemyError as e:
         current_app.logger.error(f"Database error in get_notes_for_chart: {str(e)}")
@@ -979,8 +1060,6 @@ def create_note(chart_id, title, note):
     Raises:
         SQLAlchemyError: If database operation fails
     """
-    from .models import AnalysisNote
-    
     try:
         # Create new note
         new_note = AnalysisNote(
@@ -1014,10 +1093,9 @@ def get_note_by_id(note_id):
     Raises:
         SQLAlchemyError: If database query fails
     """
-    from .models import AnalysisNote
-    
     try:
-        note = AnalysisNote.query.filter_by(id=note_id).first()
+        # Primary-key lookup: served from the identity map when already loaded
+        note = db.session.get(AnalysisNote, note_id)
         return note
     except SQLAlchemyError as e:
         current_app.logger.error(f"Database error in get_note_by_id: {str(e)}")
@@ -1038,24 +1116,40 @@ def update_note(note_id, title=None, note=None):
         
     Raises:
         SQLAlchemyError: If database operation fails
+        
+    NOTES:
+    - Fields equal to the stored values are dropped; when nothing changes no
+      UPDATE is issued, so updated_at (stamped by the model's onupdate) only
+      moves on a real change
+    - Otherwise a single UPDATE ... RETURNING statement
     """
-    from .models import AnalysisNote
-    from datetime import datetime as dt
-    
     try:
-        existing_note = AnalysisNote.query.filter_by(id=note_id).first()
-        
-        if not existing_note:
+        # Usually an identity-map hit (caller already loaded the note)
+        current = db.session.get(AnalysisNote, note_id)
+        if current is None:
             return None
         
-        # Update fields if provided
-        if title is not None:
-            existing_note.title = title
-        if note is not None:
-            existing_note.note = note
+        values = {}
+        if title is not None and title != current.title:
+            values['title'] = title
+        if note is not None and note != current.note:
+            values['note'] = note
         
-        # Update timestamp
-        existing_note.updated_at = dt.utcnow()
+        if not values:
+            # Nothing to write
+            return current
+        
+        existing_note = db.session.scalars(
+            db.update(AnalysisNote)
+            .where(AnalysisNote.id == note_id)
+            .values(**values)
+            .returning(AnalysisNote),
+            execution_options={"populate_existing": True}
+        ).one_or_none()
+        
+        if not existing_note:
+            db.session.rollback()
+            return None
         
         db.session.commit()
         
@@ -1081,15 +1175,15 @@ def delete_note(note_id):
     Raises:
         SQLAlchemyError: If database operation fails
     """
-    from .models import AnalysisNote
-    
     try:
-        note = AnalysisNote.query.filter_by(id=note_id).first()
+        deleted_id = db.session.execute(
+            db.delete(AnalysisNote).where(AnalysisNote.id == note_id).returning(AnalysisNote.id)
+        ).scalar_one_or_none()
         
-        if not note:
+        if deleted_id is None:
+            db.session.rollback()
             return False
         
-        db.session.delete(note)
         db.session.commit()
         
         current_app.logger.info(f"Note deleted: {note_id}")
@@ -1120,28 +1214,25 @@ def get_notes_summary_for_charts(chart_ids):
     Raises:
         SQLAlchemyError: If database query fails
     """
-    from .models import AnalysisNote
-    from sqlalchemy import func
-    
     try:
         if not chart_ids:
             return {}
         
-        # Query to get all notes for the specified charts
-        notes = AnalysisNote.query.filter(AnalysisNote.chart_id.in_(chart_ids))\
-            .order_by(AnalysisNote.chart_id, AnalysisNote.updated_at.desc())\
-            .all()
-        
-        # Group notes by chart_id
-        summary = {}
-        for note in notes:
-            chart_id_str = str(note.chart_id)
-            if chart_id_str not in summary:
-                summary[chart_id_str] = {'count': 0, 'titles': []}
-            summary[chart_id_str]['count'] += 1
-            summary[chart_id_str]['titles'].append(note.title)
-        
-        return summary
+        # Aggregate in SQL: one row per chart, titles newest first, note bodies never loaded
+        rows = db.session.execute(
+            db.select(
+                AnalysisNote.chart_id,
+                func.count(AnalysisNote.id),
+                func.array_agg(aggregate_order_by(AnalysisNote.title, AnalysisNote.updated_at.desc()))
+            ).where(
+                AnalysisNote.chart_id.in_(chart_ids)
+            ).group_by(AnalysisNote.chart_id)
+        ).all()
+        
+        return {
+            str(chart_id): {'count': count, 'titles': list(titles)}
+            for chart_id, count, titles in rows
+        }
         
     except SQLAlchemyError as e:
         current_app.logger.error(f"Database error in get_notes_summary_for_charts: {str(e)}")
@@ -0,0 +1,51 @@
+"""
+orjson JSON Provider
+
+Replaces Flask's stdlib-json provider so jsonify() and dict/list returns are
+serialized by orjson. Datetimes, UUIDs and numpy values are emitted natively
+in C, so model to_dict() methods can hand them over without isoformat()/str().
+"""
+
+import decimal
+from typing import Any
+import orjson
+from flask.json.provider import JSONProvider
+
+
+# Non-string keys (e.g. int house numbers) are accepted like stdlib json does
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(o: Any) -> Any:
+    """Fallback for the few types Flask's default provider handles that orjson does not."""
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes with the same options as the app provider."""
+    return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+
+class ORJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Naive datetimes are emitted without an offset, matching the previous
+    isoformat() output of the model to_dict() methods byte for byte.
+    """
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
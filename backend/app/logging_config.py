@@ -7,13 +7,147 @@ and human-readable formatting for development.
 
 import os
 import sys
+import copy
+import time
+import queue
+import atexit
 import logging
-import json
-from datetime import datetime
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from functools import lru_cache
 from typing import Any, Dict
+import orjson
 from flask import Flask, has_request_context, request, g
 
 
+@lru_cache(maxsize=4)
+def _utc_second(epoch_second: int) -> str:
+    """ISO-8601 UTC timestamp (to the second) for an epoch second, memoized
+    since consecutive log records almost always share the same second."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(epoch_second))
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that batches formatted records into one write per flush.
+    
+    The containers run with PYTHONUNBUFFERED=1, so a plain StreamHandler costs
+    a write syscall per record. Whole lines are collected here and written
+    together when the buffer reaches buffer_size characters, on any ERROR or
+    higher record, every flush_interval seconds, and on close.
+    """
+    
+    def __init__(self, stream=None, buffer_size: int = 65536, flush_interval: float = 1.0):
+        super().__init__(stream)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._buffered_chars = 0
+        self._stop_flusher = threading.Event()
+        self._start_flusher()
+    
+    def _start_flusher(self) -> None:
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, args=(self.flush_interval,),
+            name="log-flush", daemon=True
+        )
+        self._flusher.start()
+    
+    def after_fork(self) -> None:
+        """Drop the parent's unwritten lines and restart the flusher in a forked child."""
+        self._buffer.clear()
+        self._buffered_chars = 0
+        if not self._stop_flusher.is_set():
+            self._start_flusher()
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Buffer the formatted record; flush on errors or a full buffer."""
+        try:
+            msg = self.format(record) + self.terminator
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+            return
+        self._buffer.append(msg)
+        self._buffered_chars += len(msg)
+        if record.levelno >= logging.ERROR or self._buffered_chars >= self.buffer_size:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Write all buffered lines in a single call, then flush the stream."""
+        self.acquire()
+        try:
+            data = "".join(self._buffer)
+            self._buffer.clear()
+            self._buffered_chars = 0
+            # stdout may already be closed when the flusher or atexit runs at exit
+            if getattr(self.stream, "closed", False):
+                return
+            try:
+                if data:
+                    self.stream.write(data)
+                super().flush()
+            except Exception:
+                self.handleError(None)
+        finally:
+            self.release()
+    
+    def _flush_periodically(self, interval: float) -> None:
+        while not self._stop_flusher.wait(interval):
+            self.flush()
+    
+    def close(self) -> None:
+        self._stop_flusher.set()
+        self.flush()
+        super().close()
+
+
+def _request_info(record: logging.LogRecord) -> tuple:
+    """
+    Return (request_dict or None, user_id or None) for a log record.
+    
+    Records that went through RequestContextQueueHandler carry a snapshot taken
+    on the request thread; otherwise read the live Flask request context.
+    DEBUG records skip request context entirely (no LocalProxy lookups on the
+    chattiest level).
+    """
+    if hasattr(record, "request_ctx"):
+        return record.request_ctx, getattr(record, "user_id", None)
+    if record.levelno < logging.INFO or not has_request_context():
+        return None, None
+    
+    # Resolve the LocalProxy once instead of once per attribute
+    current_request = request._get_current_object()
+    req = {
+        "method": current_request.method,
+        "path": current_request.path,
+        "remote_addr": current_request.remote_addr,
+    }
+    user = getattr(g, 'current_user', None)
+    return req, (str(user.id) if user else None)
+
+
+class RequestContextQueueHandler(QueueHandler):
+    """
+    QueueHandler that snapshots Flask request context before enqueueing.
+    
+    Formatting and the stdout write happen on the QueueListener thread, which
+    has no request context, so the request fields the formatters use are
+    copied onto the record here (cheap attribute reads, no formatting).
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Attach request context and merge args; keep exc_info for the formatter."""
+        # Work on a copy: other handlers on the same logger still see the original
+        record = copy.copy(record)
+        record.request_ctx, record.user_id = _request_info(record)
+        # Merge args now: they may be mutated by the caller after logging returns
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
 class JsonFormatter(logging.Formatter):
     """
     JSON formatter for structured logging in production.
@@ -25,23 +159,20 @@ class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
         log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": f"{_utc_second(int(record.created))}.{int(record.msecs):03d}Z",
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
         
         # Add request context if available
-        if has_request_context():
-            log_data["request"] = {
-                "method": request.method,
-                "path": request.path,
-                "remote_addr": request.remote_addr,
-            }
+        req, user_id = _request_info(record)
+        if req:
+            log_data["request"] = req
             
             # Add user_id if available
-            if hasattr(g, 'current_user') and g.current_user:
-                log_data["user_id"] = str(g.current_user.id)
+            if user_id:
+                log_data["user_id"] = user_id
         
         # Add exception info if present
         if record.exc_info:
@@ -59,7 +190,9 @@ class JsonFormatter(logging.Formatter):
                 "function": record.funcName,
             }
         
-        return json.dumps(log_data, ensure_ascii=False)
+        # orjson emits UTF-8 directly (like ensure_ascii=False); anything it
+        # can't encode natively (e.g. objects in extra_data) falls back to str()
+        return orjson.dumps(log_data, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
 
 
 class ColoredFormatter(logging.Formatter):
@@ -80,25 +213,32 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
     
+    # Colored, padded level tags built once (RESET is spelled out: class-scope
+    # names aren't visible inside the comprehension body)
+    LEVEL_TAGS = {level: f"{color}{level:8s}\033[0m" for level, color in COLORS.items()}
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format log record with colors."""
-        # Get color for log level
-        color = self.COLORS.get(record.levelname, '')
+        # Get colored tag for log level (custom levels get a plain padded tag)
+        level_tag = self.LEVEL_TAGS.get(record.levelname)
+        if level_tag is None:
+            level_tag = f"{record.levelname:8s}{self.RESET}"
         
-        # Format timestamp
-        timestamp = datetime.utcnow().strftime('%H:%M:%S')
+        # Format timestamp (from the record's creation time, HH:MM:SS UTC)
+        timestamp = _utc_second(int(record.created))[11:]
         
         # Build log message
         log_parts = [
-            f"{color}{record.levelname:8s}{self.RESET}",
+            level_tag,
             f"{timestamp}",
             f"{record.name:20s}",
             record.getMessage(),
         ]
         
         # Add request context if available
-        if has_request_context():
-            log_parts.append(f"[{request.method} {request.path}]")
+        req, _ = _request_info(record)
+        if req:
+            log_parts.append(f"[{req['method']} {req['path']}]")
         
         message = " | ".join(log_parts)
         
@@ -109,6 +249,46 @@ class ColoredFormatter(logging.Formatter):
         return message
 
 
+# Background listener that formats and writes queued log records
+_queue_listener = None
+
+
+def _stop_queue_listener() -> None:
+    """Flush queued records and stop the listener thread (idempotent)."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _queue_listener = None
+
+
+def _restart_queue_listener_after_fork() -> None:
+    """
+    Give a forked child its own queue and listener thread.
+    
+    gunicorn runs with preload_app, so configure_logging runs in the master
+    and workers inherit the listener (and the batching handler's flusher)
+    without their threads. The child's copies of the queue and write buffer
+    may also hold records the master still owns, so they are not reused.
+    """
+    if _queue_listener is None:
+        return
+    log_queue = queue.SimpleQueue()
+    _queue_listener.queue = log_queue
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, RequestContextQueueHandler):
+            handler.queue = log_queue
+    for handler in _queue_listener.handlers:
+        if isinstance(handler, BufferedStreamHandler):
+            handler.after_fork()
+    _queue_listener.start()
+
+
+atexit.register(_stop_queue_listener)
+os.register_at_fork(after_in_child=_restart_queue_listener_after_fork)
+
+
 def configure_logging(app: Flask) -> None:
     """
     Configure logging for the Flask application.
@@ -121,11 +301,21 @@ def configure_logging(app: Flask) -> None:
     - Colored logging for development
     - Appropriate log levels
     - Log handlers for stdout
+    - Queued logging (LOG_QUEUE=true, default outside Lambda): request threads
+      only enqueue records; a QueueListener thread formats them and writes
+      them to stdout in batches (restarted in each forked worker)
     """
+    global _queue_listener
+    
     # Get configuration from environment
     env = os.environ.get('FLASK_ENV', 'development')
     log_level_str = os.environ.get('LOG_LEVEL', 'INFO').upper()
     
+    # Lambda freezes the process between invocations, so a background writer
+    # could sit on records indefinitely; log synchronously there by default
+    default_queue = "false" if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") else "true"
+    use_queue = os.environ.get("LOG_QUEUE", default_queue).lower() == "true"
+    
     # Parse log level
     log_level = getattr(logging, log_level_str, logging.INFO)
     
@@ -133,12 +323,16 @@ def configure_logging(app: Flask) -> None:
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
     
-    # Remove existing handlers
+    # Remove existing handlers (and drain any listener from a previous call)
+    _stop_queue_listener()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
-    # Create console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    # Create console handler (batched writes when a background thread owns it)
+    if use_queue:
+        console_handler = BufferedStreamHandler(sys.stdout)
+    else:
+        console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     
     # Choose formatter based on environment
@@ -148,7 +342,17 @@ def configure_logging(app: Flask) -> None:
         formatter = ColoredFormatter()
     
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        queue_handler = RequestContextQueueHandler(log_queue)
+        queue_handler.setLevel(log_level)
+        _queue_listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+        _queue_listener.start()
+        app.extensions["log_queue_listener"] = _queue_listener
+        root_logger.addHandler(queue_handler)
+    else:
+        root_logger.addHandler(console_handler)
     
     # Configure Flask app logger
     app.logger.setLevel(log_level)
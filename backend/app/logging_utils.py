@@ -5,23 +5,58 @@ Centralized logging helpers with built-in sensitive data filtering.
 Ensures consistent, secure logging across the application.
 """
 
-import json
+import re
+from functools import lru_cache
 from typing import Any, Dict, Optional
+import orjson
 from flask import Request
 
 
 # List of sensitive keys that should never be logged
-SENSITIVE_KEYS = {
+# (frozen: the matchers below are compiled from these once at import)
+SENSITIVE_KEYS = frozenset({
     "password", "secret", "token", "api_key", "apikey", "auth", 
     "authorization", "cookie", "session", "csrf", "client_secret",
     "access_token", "refresh_token", "id_token", "bearer"
-}
+})
 
 # PII keys that should be redacted or masked
-PII_KEYS = {
+PII_KEYS = frozenset({
     "email", "phone", "ssn", "address", "name", "first_name", 
     "last_name", "full_name", "birth_date", "birthdate"
-}
+})
+
+# Substring matchers built once at import: a single C-level scan per key
+# instead of one Python-level `in` test per entry in the sets above
+_SENSITIVE_RE = re.compile("|".join(map(re.escape, sorted(SENSITIVE_KEYS))))
+_PII_RE = re.compile("|".join(map(re.escape, sorted(PII_KEYS))))
+
+
+# Deepest dict nesting sanitize_dict will walk before truncating
+_MAX_SANITIZE_DEPTH = 64
+
+# Headers to include in logs (safe ones); built once, not per call
+_SAFE_HEADERS = frozenset({
+    "content-type", "content-length", "accept", 
+    "user-agent", "referer", "origin"
+})
+
+# Exact types safe_str renders with a plain str() (no sanitizing needed)
+_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+@lru_cache(maxsize=4096)
+def _classify(key_lower: str) -> tuple:
+    """
+    Classify a lower-cased key as (is_sensitive, is_pii).
+    
+    Keys come from a small vocabulary (JSON field and header names), so after
+    the first request each classification is a dict lookup.
+    """
+    return (
+        _SENSITIVE_RE.search(key_lower) is not None,
+        _PII_RE.search(key_lower) is not None,
+    )
 
 
 def sanitize_dict(data: Dict[str, Any], redact_pii: bool = True) -> Dict[str, Any]:
@@ -42,33 +77,53 @@ def sanitize_dict(data: Dict[str, Any], redact_pii: bool = True) -> Dict[str, An
     if not isinstance(data, dict):
         return data
     
+    # Iterative walk (explicit worklist instead of recursion): each entry pairs a
+    # source dict with the output dict it fills, so output keeps input key order
+    classify = _classify
     sanitized = {}
-    for key, value in data.items():
-        key_lower = key.lower()
+    todo = [(data, sanitized, 0)]
+    
+    while todo:
+        source, target, depth = todo.pop()
         
-        # Skip sensitive keys entirely
-        if any(sensitive in key_lower for sensitive in SENSITIVE_KEYS):
+        # Bound nesting (the recursive version hit RecursionError here; also
+        # guards against self-referencing dicts passed to safe_str)
+        if depth >= _MAX_SANITIZE_DEPTH:
+            target["..."] = "[MAX_DEPTH]"
             continue
         
-        # Redact PII if enabled
-        if redact_pii and any(pii in key_lower for pii in PII_KEYS):
-            if key_lower == "email" and isinstance(value, str) and "@" in value:
-                # For email, show only domain
-                sanitized[key] = f"***@{value.split('@')[1]}"
+        for key, value in source.items():
+            key_lower = key.lower()
+            is_sensitive, is_pii = classify(key_lower)
+            
+            # Skip sensitive keys entirely
+            if is_sensitive:
+                continue
+            
+            # Redact PII if enabled
+            if redact_pii and is_pii:
+                if key_lower == "email" and isinstance(value, str) and "@" in value:
+                    # For email, show only domain
+                    target[key] = f"***@{value.split('@')[1]}"
+                else:
+                    target[key] = "[REDACTED]"
+                continue
+            
+            # Queue nested dicts (directly or inside lists) for sanitizing
+            if isinstance(value, dict):
+                child = target[key] = {}
+                todo.append((value, child, depth + 1))
+            elif isinstance(value, list):
+                items = target[key] = []
+                for item in value:
+                    if isinstance(item, dict):
+                        child = {}
+                        items.append(child)
+                        todo.append((item, child, depth + 1))
+                    else:
+                        items.append(item)
             else:
-                sanitized[key] = "[REDACTED]"
-            continue
-        
-        # Recursively sanitize nested dicts
-        if isinstance(value, dict):
-            sanitized[key] = sanitize_dict(value, redact_pii)
-        elif isinstance(value, list):
-            sanitized[key] = [
-                sanitize_dict(item, redact_pii) if isinstance(item, dict) else item
-                for item in value
-            ]
-        else:
-            sanitized[key] = value
+                target[key] = value
     
     return sanitized
 
@@ -85,12 +140,12 @@ def sanitize_request_data(request: Request, max_length: int = 500) -> str:
         Sanitized request data as string, truncated if needed
     """
     try:
-        # Try to parse as JSON
+        # Try to parse as JSON (get_json caches on the request, so repeat calls are free)
         if request.is_json:
             data = request.get_json(silent=True)
             if data:
                 sanitized = sanitize_dict(data)
-                result = json.dumps(sanitized, separators=(',', ':'))
+                result = orjson.dumps(sanitized, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
             else:
                 result = "No JSON data"
         else:
@@ -116,22 +171,16 @@ def sanitize_headers(headers: Dict[str, str]) -> Dict[str, str]:
     Returns:
         Sanitized headers safe for logging
     """
-    # Headers to include in logs (safe ones)
-    safe_headers = {
-        "content-type", "content-length", "accept", 
-        "user-agent", "referer", "origin"
-    }
-    
     sanitized = {}
     for key, value in headers.items():
         key_lower = key.lower()
         
         # Skip sensitive headers
-        if any(sensitive in key_lower for sensitive in SENSITIVE_KEYS):
+        if _classify(key_lower)[0]:
             continue
         
         # Only include safe headers
-        if key_lower in safe_headers:
+        if key_lower in _SAFE_HEADERS:
             # Truncate user-agent if too long
             if key_lower == "user-agent" and len(value) > 100:
                 sanitized[key] = value[:100] + "..."
@@ -197,10 +246,24 @@ def safe_str(value: Any, max_length: int = 200) -> str:
     Returns:
         Safe string representation, truncated if needed
     """
+    # Fast path: most logged values are scalars - one set lookup, no try block
+    if type(value) in _SCALAR_TYPES:
+        result = str(value)
+    else:
+        result = _safe_str_slow(value)
+    
+    if len(result) > max_length:
+        result = result[:max_length] + "..."
+    
+    return result
+
+
+def _safe_str_slow(value: Any) -> str:
+    """Render a container or unknown type for safe_str (dicts are sanitized)."""
     try:
         if isinstance(value, dict):
             sanitized = sanitize_dict(value)
-            result = json.dumps(sanitized, separators=(',', ':'))
+            result = orjson.dumps(sanitized, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
         elif isinstance(value, (list, tuple)):
             result = str(value)
         else:
@@ -208,7 +271,4 @@ def safe_str(value: Any, max_length: int = 200) -> str:
     except Exception:
         result = "[Unable to serialize]"
     
-    if len(result) > max_length:
-        result = result[:max_length] + "..."
-    
     return result
@@ -18,14 +18,23 @@ USAGE:
 - Both is_active flags must be True for authorization
 """
 
+import threading
+from collections import OrderedDict
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import JSONB
+from .json_provider import dumps_bytes
 from datetime import datetime as dt
-import uuid
 
 # SQLAlchemy instance (initialized in __init__.py)
 db = SQLAlchemy()
 
+# Serialized Profile.to_dict() per worker, keyed by profile id and tagged with
+# updated_at (see Profile.to_json_bytes)
+PROFILE_JSON_CACHE_SIZE = 1024
+_profile_json_cache = OrderedDict()
+_profile_json_cache_lock = threading.Lock()
+
 
 class ApprovedUser(db.Model):
     """
@@ -80,19 +89,18 @@ class User(db.Model):
     """
     __tablename__ = "users"
     
-    # Primary key: UUID v4
+    # Primary key: UUID v4, generated by the database (returned via INSERT ... RETURNING)
     # Prevents enumeration attacks (can't guess valid user IDs)
     id = db.Column(
         db.UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
         server_default=db.text("uuid_generate_v4()")
     )
     
     # Google's unique user identifier from OAuth "sub" claim
     # This is the authoritative identifier (more reliable than email)
-    # Indexed and unique to prevent duplicate accounts
-    google_sub = db.Column(db.Text, unique=True, nullable=False, index=True)
+    # Unique to prevent duplicate accounts (see __table_args__)
+    google_sub = db.Column(db.Text, nullable=False)
     
     # User's email from Google OAuth
     # Stored for convenience but google_sub is the primary identifier
@@ -121,6 +129,17 @@ class User(db.Model):
     # Both users.is_active AND approved_users.is_active must be True
     is_active = db.Column(db.Boolean, nullable=False, default=True, server_default=db.text("true"))
     
+    # The google_sub uniqueness constraint doubles as the covering index for the
+    # per-request lookup: it includes exactly the columns is_user_authorized()
+    # selects (index-only scan), so no separate google_sub index is needed
+    __table_args__ = (
+        db.UniqueConstraint(
+            'google_sub',
+            name='users_google_sub_key',
+            postgresql_include=['id', 'email', 'is_active']
+        ),
+    )
+    
     def __repr__(self):
         return f"<User {self.email} (google_sub={self.google_sub[:10]}...)>"
     
@@ -129,14 +148,15 @@ class User(db.Model):
         Convert user to dictionary for API responses.
         
         Returns:
-            dict: User data (excludes sensitive fields like google_sub)
+            dict: User data (excludes sensitive fields like google_sub).
+            Datetimes are left as-is for the orjson provider to emit.
         """
         return {
             "id": str(self.id),
             "email": self.email,
             "name": self.name,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "last_login_at": self.last_login_at.isoformat() if self.last_login_at else None,
+            "created_at": self.created_at,
+            "last_login_at": self.last_login_at,
             "is_active": self.is_active
         }
 
@@ -162,11 +182,10 @@ class Profile(db.Model):
     """
     __tablename__ = "profiles"
     
-    # Primary key: UUID v4
+    # Primary key: UUID v4, generated by the database (returned via INSERT ... RETURNING)
     id = db.Column(
         db.UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
         server_default=db.text("uuid_generate_v4()")
     )
     
@@ -221,6 +240,11 @@ class Profile(db.Model):
             'house_system', 'ayanamsha', 'node_type',
             name='uq_user_profile'
         ),
+        db.Index(
+            'idx_profiles_user_updated',
+            'user_id', db.text('updated_at DESC'),
+            postgresql_where=db.text('is_active = true')
+        ),
     )
     
     def __repr__(self):
@@ -244,11 +268,37 @@ class Profile(db.Model):
             "house_system": self.house_system,
             "ayanamsha": self.ayanamsha,
             "node_type": self.node_type,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
             "is_active": self.is_active
         }
 
+    def to_json_bytes(self):
+        """
+        Serialized to_dict(), memoized per worker.
+        
+        Every write to a serialized field bumps updated_at (the column's
+        onupdate, and the CASE in get_or_create_profile's upsert), so an
+        edited profile misses on its new updated_at and is re-serialized.
+        
+        Returns:
+            bytes: UTF-8 JSON of to_dict()
+        """
+        key = self.id
+        with _profile_json_cache_lock:
+            entry = _profile_json_cache.get(key)
+            if entry is not None and entry[0] == self.updated_at:
+                _profile_json_cache.move_to_end(key)
+                return entry[1]
+        
+        body = dumps_bytes(self.to_dict())
+        with _profile_json_cache_lock:
+            _profile_json_cache[key] = (self.updated_at, body)
+            _profile_json_cache.move_to_end(key)
+            while len(_profile_json_cache) > PROFILE_JSON_CACHE_SIZE:
+                _profile_json_cache.popitem(last=False)
+        return body
+
 
 class Chart(db.Model):
     """
@@ -269,11 +319,10 @@ class Chart(db.Model):
     """
     __tablename__ = "charts"
     
-    # Primary key: UUID v4
+    # Primary key: UUID v4, generated by the database (returned via INSERT ... RETURNING)
     id = db.Column(
         db.UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
         server_default=db.text("uuid_generate_v4()")
     )
     
@@ -289,11 +338,12 @@ class Chart(db.Model):
     )
     
     # Calculated chart data (JSONB for flexibility)
-    ascendant_data = db.Column(db.JSON, nullable=False)  # Ascendant position, nakshatra, etc.
-    planets_data = db.Column(db.JSON, nullable=False)  # Array of planet objects
-    house_cusps = db.Column(db.JSON, nullable=True)  # House cusp positions
-    bhav_chalit_data = db.Column(db.JSON, nullable=False)  # Bhav Chalit house system
-    chart_metadata = db.Column(db.JSON, nullable=False)  # Calculation metadata
+    # Typed as JSONB to match schema.sql so binds go straight to jsonb, no json->jsonb cast
+    ascendant_data = db.Column(JSONB, nullable=False)  # Ascendant position, nakshatra, etc.
+    planets_data = db.Column(JSONB, nullable=False)  # Array of planet objects
+    house_cusps = db.Column(JSONB, nullable=True)  # House cusp positions
+    bhav_chalit_data = db.Column(JSONB, nullable=False)  # Bhav Chalit house system
+    chart_metadata = db.Column(JSONB, nullable=False)  # Calculation metadata
     
     # Metadata
     calculated_at = db.Column(
@@ -323,7 +373,7 @@ class Chart(db.Model):
             "houseCusps": self.house_cusps,
             "bhavChalit": self.bhav_chalit_data,
             "metadata": self.chart_metadata,
-            "calculated_at": self.calculated_at.isoformat() if self.calculated_at else None
+            "calculated_at": self.calculated_at
         }
 
 
@@ -347,11 +397,10 @@ class AnalysisNote(db.Model):
     """
     __tablename__ = "analysis_notes"
     
-    # Primary key: UUID v4
+    # Primary key: UUID v4, generated by the database (returned via INSERT ... RETURNING)
     id = db.Column(
         db.UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
         server_default=db.text("uuid_generate_v4()")
     )
     
@@ -402,7 +451,7 @@ class AnalysisNote(db.Model):
             "id": str(self.id),
             "title": self.title,
             "note": self.note,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
         }
 
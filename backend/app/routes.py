@@ -1,139 +1,192 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, g
+from pydantic import ValidationError
+from werkzeug.exceptions import HTTPException
 from .schemas import ChartRequest, DashaRequest, ProfileUpdateRequest, AnalysisNoteCreate, AnalysisNoteUpdate
 from .auth import get_current_user
-from .logging_utils import sanitize_request_data, sanitize_dict
-from .astro.engine import init_ephemeris, julian_day_utc, ascendant_and_houses, compute_planets, compute_whole_sign_cusps, compute_sripati_cusps
-from .astro.utils import (
-    to_utc,
-    sign_index,
-    house_from_sign,
-    house_from_cusps,
-    norm360,
-    format_utc_offset,
-    get_nakshatra_and_charan,
-    get_navamsha_info,
+from .chart_calc import calculate_chart_for_profile
+from .db import (
+    CURRENT_CHART_SCHEMA_VERSION,
+    get_or_create_profile,
+    get_user_profile,
+    get_user_profiles,
+    update_profile,
+    delete_profile,
+    get_cached_chart_json,
+    save_chart,
+    get_notes_for_chart,
+    get_notes_summary_for_charts,
+    create_note,
+    get_note_by_id,
+    update_note,
+    delete_note,
 )
-from .astro.constants import PLANET_MEAN_SPEEDS, STATIONARY_THRESHOLDS, COMBUSTION_THRESHOLDS
+from .logging_utils import sanitize_dict
+from .json_provider import dumps_bytes
+from .astro.engine import init_ephemeris, julian_day_utc, compute_moon_longitude
+from .astro.utils import to_utc
 from .astro.dasha import calculate_vimshottari_timeline
 from datetime import datetime
 import logging
+import uuid
 
 bp = Blueprint("api", __name__)
 
-@bp.route("/chart", methods=["POST"])
-def chart():
-    # AUTHENTICATION REQUIRED - Validate session and authorization
-    session_data = get_current_user()
-    if isinstance(session_data, tuple):  # Error response (401)
-        return session_data
-    
-    # Get authenticated user from Flask g context (set by get_current_user)
-    from flask import g
-    user = g.current_user
-    
-    # Log request information
-    current_app.logger.info(f"🔵 API Request received - Method: {request.method}, Path: {request.path}")
-    # Don't log full headers (contains auth cookies) or full request data (may contain PII)
-    current_app.logger.debug(f"📦 Request Content-Type: {request.content_type}, Length: {request.content_length or 0} bytes")
-    
-    try:
-        payload = ChartRequest.model_validate_json(request.data)
-        # Log validated payload (sanitized)
-        sanitized_payload = sanitize_dict(payload.model_dump())
-        current_app.logger.info(f"✅ Validated chart request")
-        current_app.logger.debug(f"Chart request params: {sanitized_payload}")
-    except Exception as e:
-        # Log and print validation error
-        print(f"❌ Request validation error: {str(e)}")
-        current_app.logger.error(f"Request validation error: {str(e)}")
-        return jsonify({
-            "error": {
-                "code": "VALIDATION_ERROR",
-                "message": str(e),
-                "details": {"field": "request", "value": "invalid"}
-            }
-        }), 400
+# User-facing message for unexpected errors, keyed by endpoint
+_CALCULATION_ERROR_MESSAGES = {
+    "api.chart": "Failed to calculate chart",
+    "api.get_chart_by_profile": "Failed to retrieve chart",
+    "api.dasha": "Failed to calculate dasha",
+}
 
-    try:
-        # Step 1: Get or create profile for this user + birth details
-        from .db import get_or_create_profile, get_cached_chart, save_chart
-        
-        birth_details = {
-            'datetime': payload.datetime,
-            'tz': payload.tz,
-            'utc_offset_minutes': payload.utcOffsetMinutes,
-            'latitude': payload.latitude,
-            'longitude': payload.longitude
+
+@bp.errorhandler(ValidationError)
+def handle_validation_error(e):
+    """Return request validation failures as a structured 400 response."""
+    current_app.logger.warning(f"❌ Request validation error on {request.path}: {str(e)}")
+    return jsonify({
+        "error": {
+            "code": "VALIDATION_ERROR",
+            "message": str(e),
+            "details": {"field": "request", "value": "invalid"}
         }
-        
-        chart_settings = {
-            'house_system': payload.houseSystem or current_app.config["HOUSE_SYSTEM"],
-            'ayanamsha': payload.ayanamsha or current_app.config["AYANAMSHA"],
-            'node_type': payload.nodeType
+    }), 400
+
+
+@bp.errorhandler(Exception)
+def handle_calculation_error(e):
+    """Return unexpected errors as a structured 500 response."""
+    if isinstance(e, HTTPException):
+        # Let Flask render aborts/404s as usual
+        return e
+    message = _CALCULATION_ERROR_MESSAGES.get(request.endpoint, "Failed to process request")
+    current_app.logger.error(f"💥 {message}: {str(e)}", exc_info=True)
+    return jsonify({
+        "error": {
+            "code": "CALCULATION_ERROR",
+            "message": message,
+            "details": {"error": str(e)}
         }
-        
-        profile = get_or_create_profile(
-            user_id=user.id,
-            birth_details=birth_details,
-            chart_settings=chart_settings,
-            name=payload.profileName
-        )
-        
-        # Step 2: Check if chart is already cached
-        cached_chart = get_cached_chart(profile.id)
-        
-        if cached_chart:
-            # Return cached chart data
-            current_app.logger.info(f"🎯 Cache hit - returning cached chart for profile: {profile.id}")
-            
-            response_data = {
-                "profile_id": str(profile.id),
-                "chart_id": str(cached_chart.id),
-                "profile": profile.to_dict(),
-                "metadata": cached_chart.chart_metadata,
-                "ascendant": cached_chart.ascendant_data,
-                "planets": cached_chart.planets_data,
-                "bhavChalit": cached_chart.bhav_chalit_data
-            }
-            
-            return jsonify(response_data), 200
-        
-        # Step 3: Calculate chart (cache miss)
-        current_app.logger.info(f"💫 Cache miss - calculating chart for profile: {profile.id}")
+    }), 500
+
+
+def _chart_etag(profile, chart_id):
+    """
+    Weak ETag for a chart response.
+
+    The body is fixed by the profile row (any edit bumps updated_at), the
+    chart row and the chart schema version, so those identify it without
+    hashing the payload. Weak because cache-hit and freshly calculated bodies
+    differ in whitespace only.
+    """
+    return f"{profile.id}-{chart_id}-{profile.updated_at.isoformat()}-v{CURRENT_CHART_SCHEMA_VERSION}"
+
+
+def _chart_response(profile):
+    """
+    Build the chart response for a profile, serving the cached chart when fresh.
+
+    Shared by POST /chart and GET /chart/<profile_id> so both return the same
+    payload shape. On a cache hit the stored chart JSON is spliced into the
+    body as-is; on a cache miss the chart is calculated and saved. GET
+    responses carry an ETag, and a matching If-None-Match on a cache hit is
+    answered with 304 before the body is built.
+    """
+    conditional = request.method == "GET"
+    cached = get_cached_chart_json(profile.id, profile.updated_at)
+
+    if cached:
+        current_app.logger.info("🎯 Cache hit - returning cached chart for profile: %s", profile.id)
+        chart_id, chart_json = cached
+        etag = _chart_etag(profile, chart_id) if conditional else None
+        if etag and request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            # chart_json is a complete object; drop its "{" and append its members
+            body = b"".join((
+                b'{"profile_id":', dumps_bytes(str(profile.id)),
+                b',"chart_id":', dumps_bytes(str(chart_id)),
+                b',"profile":', profile.to_json_bytes(),
+                b',', chart_json[1:],
+            ))
+            response = current_app.response_class(body, mimetype="application/json")
+    else:
+        current_app.logger.info("💫 Cache miss - calculating chart for profile: %s", profile.id)
 
         # Use shared chart calculation helper so POST and lazy paths match
-        from .chart_calc import calculate_chart_for_profile
         chart_data = calculate_chart_for_profile(profile)
 
-        # Step 4: Save calculated chart to database (cache for future requests)
+        # Save calculated chart to database (cache for future requests)
         saved_chart = save_chart(profile.id, chart_data)
-        current_app.logger.info(f"💾 Chart saved to cache for profile: {profile.id}")
+        current_app.logger.info("💾 Chart saved to cache for profile: %s", profile.id)
 
-        # Step 5: Return chart data with profile information
-        response_data = {
+        chart_id = str(saved_chart.id) if saved_chart else None
+        etag = _chart_etag(profile, chart_id) if conditional and chart_id else None
+        response = jsonify({
             "profile_id": str(profile.id),
-            "chart_id": str(saved_chart.id) if saved_chart else None,
+            "chart_id": chart_id,
             "profile": profile.to_dict(),
             "metadata": chart_data["metadata"],
             "ascendant": chart_data["ascendant"],
             "planets": chart_data["planets"],
             "bhavChalit": chart_data["bhavChalit"],
-        }
+        })
 
-        # Log successful response
-        current_app.logger.info(f"🎉 Chart calculation successful")
-        return jsonify(response_data), 200
+    if etag:
+        response.set_etag(etag, weak=True)
+        # Per-user data: browsers may keep it but must revalidate before reuse
+        response.headers["Cache-Control"] = "private, no-cache"
+    return response
 
-    except Exception as e:
-        # Log the error for debugging
-        current_app.logger.error(f"💥 Chart calculation error: {str(e)}", exc_info=True)
-        return jsonify({
-            "error": {
-                "code": "CALCULATION_ERROR",
-                "message": "Failed to calculate chart",
-                "details": {"error": str(e)}
-            }
-        }), 500
+
+@bp.route("/chart", methods=["POST"])
+def chart():
+    # AUTHENTICATION REQUIRED - Validate session and authorization
+    session_data = get_current_user()
+    if isinstance(session_data, tuple):  # Error response (401)
+        return session_data
+    
+    # Get authenticated user from Flask g context (set by get_current_user)
+    user = g.current_user
+    
+    # Log request information
+    current_app.logger.info("🔵 API Request received - Method: %s, Path: %s", request.method, request.path)
+    # Don't log full headers (contains auth cookies) or full request data (may contain PII)
+    # Lazy %-formatting: the message is only built if DEBUG is enabled
+    current_app.logger.debug("📦 Request Content-Type: %s, Length: %s bytes", request.content_type, request.content_length or 0)
+    
+    # Validation errors are rendered by handle_validation_error
+    payload = ChartRequest.model_validate_json(request.data)
+    current_app.logger.info("✅ Validated chart request")
+    # Log validated payload (sanitized) - only dump/sanitize when DEBUG is on
+    if current_app.logger.isEnabledFor(logging.DEBUG):
+        current_app.logger.debug(f"Chart request params: {sanitize_dict(payload.model_dump(exclude_none=True))}")
+
+    # Step 1: Get or create profile for this user + birth details
+    birth_details = {
+        'datetime': payload.datetime,
+        'tz': payload.tz,
+        'utc_offset_minutes': payload.utcOffsetMinutes,
+        'latitude': payload.latitude,
+        'longitude': payload.longitude
+    }
+    
+    chart_settings = {
+        'house_system': payload.houseSystem or current_app.config["HOUSE_SYSTEM"],
+        'ayanamsha': payload.ayanamsha or current_app.config["AYANAMSHA"],
+        'node_type': payload.nodeType
+    }
+    
+    profile = get_or_create_profile(
+        user_id=user.id,
+        birth_details=birth_details,
+        chart_settings=chart_settings,
+        name=payload.profileName
+    )
+    
+    # Step 2: Serve cached chart or calculate and cache it
+    response = _chart_response(profile)
+    current_app.logger.info("🎉 Chart calculation successful")
+    return response
 
 
 @bp.route("/chart/<profile_id>", methods=["GET"])
@@ -156,74 +209,21 @@ def get_chart_by_profile(profile_id):
         return session_data
     
     # Get authenticated user from Flask g context
-    from flask import g
     user = g.current_user
     
-    current_app.logger.info(f"🔵 GET /chart/{profile_id} - User ID: {user.id}")
+    current_app.logger.info("🔵 GET /chart/%s - User ID: %s", profile_id, user.id)
     
-    try:
-        # Step 1: Load profile with ownership verification
-        from .db import get_user_profile, get_cached_chart, save_chart
-        
-        profile, error_response = get_user_profile(profile_id, user.id)
-        
-        if error_response:
-            # Return error (403 or 404)
-            return error_response
-        
-        # Step 2: Check if chart is cached
-        cached_chart = get_cached_chart(profile.id)
-        
-        if cached_chart:
-            # Return cached chart
-            current_app.logger.info(f"🎯 Cache hit - returning cached chart for profile: {profile.id}")
-            
-            response_data = {
-                "profile_id": str(profile.id),
-                "chart_id": str(cached_chart.id),
-                "profile": profile.to_dict(),
-                "metadata": cached_chart.chart_metadata,
-                "ascendant": cached_chart.ascendant_data,
-                "planets": cached_chart.planets_data,
-                "bhavChalit": cached_chart.bhav_chalit_data
-            }
-            
-            return jsonify(response_data), 200
-        
-        # Step 3: Chart not cached - recalculate
-        current_app.logger.info(f"💫 Cache miss - recalculating chart for profile: {profile.id}")
-        
-        # Use extracted calculation function
-        from .chart_calc import calculate_chart_for_profile
-        chart_data = calculate_chart_for_profile(profile)
-        
-        # Save to cache
-        saved_chart = save_chart(profile.id, chart_data)
-        current_app.logger.info(f"💾 Chart recalculated and saved to cache for profile: {profile.id}")
-        
-        # Return response
-        response_data = {
-            "profile_id": str(profile.id),
-            "chart_id": str(saved_chart.id) if saved_chart else None,
-            "profile": profile.to_dict(),
-            "metadata": chart_data["metadata"],
-            "ascendant": chart_data["ascendant"],
-            "planets": chart_data["planets"],
-            "bhavChalit": chart_data["bhavChalit"]
-        }
-        
-        current_app.logger.info(f"🎉 Chart retrieval successful")
-        return jsonify(response_data), 200
-        
-    except Exception as e:
-        current_app.logger.error(f"💥 Chart retrieval error: {str(e)}", exc_info=True)
-        return jsonify({
-            "error": {
-                "code": "CALCULATION_ERROR",
-                "message": "Failed to retrieve chart",
-                "details": {"error": str(e)}
-            }
-        }), 500
+    # Step 1: Load profile with ownership verification
+    profile, error_response = get_user_profile(profile_id, user.id)
+
+    if error_response:
+        # Return error (403 or 404)
+        return error_response
+
+    # Step 2: Serve cached chart or recalculate and cache it
+    response = _chart_response(profile)
+    current_app.logger.info("🎉 Chart retrieval successful")
+    return response
 
 
 @bp.route("/dasha", methods=["POST"])
@@ -234,92 +234,52 @@ def dasha():
         return session_data
     
     # Log request information
-    current_app.logger.info(f"🔵 Dasha API Request received - Method: {request.method}, Path: {request.path}")
+    current_app.logger.info("🔵 Dasha API Request received - Method: %s, Path: %s", request.method, request.path)
     # Don't log full headers (contains auth cookies) or full request data (may contain PII)
-    current_app.logger.debug(f"📦 Request Content-Type: {request.content_type}, Length: {request.content_length or 0} bytes")
-    
-    try:
-        payload = DashaRequest.model_validate_json(request.data)
-        # Log validated payload (sanitized)
-        sanitized_payload = sanitize_dict(payload.model_dump())
-        current_app.logger.info(f"✅ Validated dasha request")
-        current_app.logger.debug(f"Dasha request params: {sanitized_payload}")
-    except Exception as e:
-        # Log validation error
-        current_app.logger.warning(f"❌ Dasha request validation error: {str(e)}")
-        return jsonify({
-            "error": {
-                "code": "VALIDATION_ERROR",
-                "message": str(e),
-                "details": {"field": "request", "value": "invalid"}
-            }
-        }), 400
+    # Lazy %-formatting: the message is only built if DEBUG is enabled
+    current_app.logger.debug("📦 Request Content-Type: %s, Length: %s bytes", request.content_type, request.content_length or 0)
+    
+    # Validation errors are rendered by handle_validation_error
+    payload = DashaRequest.model_validate_json(request.data)
+    current_app.logger.info("✅ Validated dasha request")
+    # Log validated payload (sanitized) - only dump/sanitize when DEBUG is on
+    if current_app.logger.isEnabledFor(logging.DEBUG):
+        current_app.logger.debug(f"Dasha request params: {sanitize_dict(payload.model_dump(exclude_none=True))}")
 
-    try:
-        # Convert datetime string to datetime object
-        birth_dt = datetime.fromisoformat(payload.datetime.replace('Z', '+00:00'))
-        
-        # Convert optional date strings to datetime objects
-        from_date = None
-        to_date = None
-        at_date = None
-        
-        if payload.fromDate:
-            from_date = datetime.fromisoformat(payload.fromDate.replace('Z', '+00:00'))
-        if payload.toDate:
-            to_date = datetime.fromisoformat(payload.toDate.replace('Z', '+00:00'))
-        if payload.atDate:
-            at_date = datetime.fromisoformat(payload.atDate.replace('Z', '+00:00'))
-        
-        # Calculate birth chart to get Moon's sidereal longitude
-        dt_utc = to_utc(payload.datetime, None, None, payload.latitude, payload.longitude)
-        jd_ut = julian_day_utc(dt_utc)
-        
-        # Initialize ephemeris with ayanamsha from request or default
-        effective_ayanamsha = payload.ayanamsha or current_app.config["AYANAMSHA"]
-        init_ephemeris(current_app.config["EPHE_PATH"], effective_ayanamsha)
-        
-        # Get Moon's sidereal longitude
-        planets = compute_planets(jd_ut, "MEAN")  # Use MEAN nodes for dasha calculation
-        moon_longitude_sidereal = None
-        
-        for planet in planets:
-            if planet["planet"] == "Moon":
-                moon_longitude_sidereal = planet["longitude"]
-                break
-        
-        if moon_longitude_sidereal is None:
-            raise ValueError("Could not calculate Moon's position")
-        
-        # Calculate Vimshottari timeline
-        timeline, metadata = calculate_vimshottari_timeline(
-            birth_utc=birth_dt,
-            moon_longitude_sidereal=moon_longitude_sidereal,
-            depth=payload.depth,
-            from_date=from_date,
-            to_date=to_date,
-            at_date=at_date
-        )
-        
-        result = {
-            "timeline": timeline,
-            "metadata": metadata
-        }
-        
-        # Log successful response
-        current_app.logger.info(f"🎉 Dasha calculation successful")
-        return jsonify(result), 200
-        
-    except Exception as e:
-        # Log error for debugging
-        current_app.logger.error(f"💥 Dasha calculation error: {str(e)}", exc_info=True)
-        return jsonify({
-            "error": {
-                "code": "CALCULATION_ERROR",
-                "message": "Failed to calculate dasha",
-                "details": {"error": str(e)}
-            }
-        }), 500
+    # Convert datetime string to datetime object
+    # (fromisoformat accepts a trailing 'Z' natively since Python 3.11)
+    # fromDate/toDate/atDate arrive already parsed by DashaRequest
+    birth_dt = datetime.fromisoformat(payload.datetime)
+    
+    # Calculate birth chart to get Moon's sidereal longitude
+    dt_utc = to_utc(payload.datetime, None, None, payload.latitude, payload.longitude)
+    jd_ut = julian_day_utc(dt_utc)
+    
+    # Initialize ephemeris with ayanamsha from request or default
+    effective_ayanamsha = payload.ayanamsha or current_app.config["AYANAMSHA"]
+    init_ephemeris(current_app.config["EPHE_PATH"], effective_ayanamsha)
+    
+    # Get Moon's sidereal longitude (the only body dasha needs)
+    moon_longitude_sidereal = compute_moon_longitude(jd_ut)
+    
+    # Calculate Vimshottari timeline
+    timeline, metadata = calculate_vimshottari_timeline(
+        birth_utc=birth_dt,
+        moon_longitude_sidereal=moon_longitude_sidereal,
+        depth=payload.depth,
+        from_date=payload.fromDate,
+        to_date=payload.toDate,
+        at_date=payload.atDate
+    )
+    
+    result = {
+        "timeline": timeline,
+        "metadata": metadata
+    }
+    
+    # Log successful response
+    current_app.logger.info("🎉 Dasha calculation successful")
+    return jsonify(result), 200
 
 
 @bp.route("/profiles", methods=["GET"])
@@ -341,15 +301,12 @@ def get_profiles():
         return session_data
     
     # Get authenticated user from Flask g context (set by get_current_user)
-    from flask import g
     user = g.current_user
     
     current_app.logger.info(f"🔵 GET /profiles - User ID: {user.id}")
     
     try:
         # Get all active profiles for the authenticated user
-        from .db import get_user_profiles, get_notes_summary_for_charts
-        
         profiles = get_user_profiles(user.id)
         
         # Convert profiles to dictionaries
@@ -416,22 +373,23 @@ def update_profile_endpoint(profile_id):
         return session_data
     
     # Get authenticated user from Flask g context (set by get_current_user)
-    from flask import g
     user = g.current_user
     
     current_app.logger.info(f"🔵 PATCH /profiles/{profile_id} - User ID: {user.id}")
     # Don't log full request data (may contain PII)
-    current_app.logger.debug(f"📦 Request Length: {request.content_length or 0} bytes")
+    # Lazy %-formatting: the message is only built if DEBUG is enabled
+    current_app.logger.debug("📦 Request Length: %s bytes", request.content_length or 0)
     
     try:
         # Step 1: Parse and validate request body
         payload = ProfileUpdateRequest.model_validate_json(request.data)
-        sanitized_payload = sanitize_dict(payload.model_dump(exclude_none=True))
+        # Convert Pydantic model to dict once, excluding None values
+        updates = payload.model_dump(exclude_none=True)
         current_app.logger.info(f"✅ Profile update validated")
-        current_app.logger.debug(f"Update params: {sanitized_payload}")
+        if current_app.logger.isEnabledFor(logging.DEBUG):
+            current_app.logger.debug(f"Update params: {sanitize_dict(updates)}")
     except Exception as e:
-        # Log and print validation error
-        print(f"❌ Request validation error: {str(e)}")
+        # Log validation error
         current_app.logger.error(f"Request validation error: {str(e)}")
         return jsonify({
             "error": {
@@ -443,11 +401,6 @@ def update_profile_endpoint(profile_id):
     
     try:
         # Step 2: Update profile
-        from .db import update_profile
-        
-        # Convert Pydantic model to dict, excluding None values
-        updates = payload.model_dump(exclude_none=True)
-        
         # Call update_profile function
         profile, error_response = update_profile(profile_id, user.id, updates)
         
@@ -489,15 +442,12 @@ def delete_profile_endpoint(profile_id):
         return session_data
     
     # Get authenticated user from Flask g context (set by get_current_user)
-    from flask import g
     user = g.current_user
     
     current_app.logger.info(f"🔵 DELETE /profiles/{profile_id} - User ID: {user.id}")
     
     try:
         # Step 1: Delete profile
-        from .db import delete_profile
-        
         # Call delete_profile function
         success, error_response = delete_profile(profile_id, user.id)
         
@@ -548,15 +498,11 @@ def get_profile_notes(profile_id):
         return session_data
     
     # Get authenticated user from Flask g context (set by get_current_user)
-    from flask import g
     user = g.current_user
     
     current_app.logger.info(f"🔵 GET /profiles/{profile_id}/notes - User ID: {user.id}")
     
     try:
-        from .db import get_user_profile, get_notes_for_chart
-        import uuid
-        
         # Step 1: Verify profile exists and user owns it
         try:
             profile_uuid = uuid.UUID(profile_id)
@@ -580,7 +526,7 @@ def get_profile_notes(profile_id):
             current_app.logger.info(f"⚠️  Profile {profile_id} has no chart yet - returning empty notes array")
             return jsonify([]), 200
         
-        current_app.logger.debug(f"Profile found with chart: profile_id={profile_id}, chart_id={chart.id}")
+        current_app.logger.debug("Profile found with chart: profile_id=%s, chart_id=%s", profile_id, chart.id)
         
         # Step 3: Get all notes for the chart
         notes = get_notes_for_chart(chart.id)
@@ -624,21 +570,20 @@ def create_profile_note(profile_id):
         return session_data
     
     # Get authenticated user from Flask g context (set by get_current_user)
-    from flask import g
     user = g.current_user
     
     current_app.logger.info(f"🔵 POST /profiles/{profile_id}/notes - User ID: {user.id}")
     # Don't log full request data (may contain PII)
-    current_app.logger.debug(f"📦 Request Length: {request.content_length or 0} bytes")
+    # Lazy %-formatting: the message is only built if DEBUG is enabled
+    current_app.logger.debug("📦 Request Length: %s bytes", request.content_length or 0)
     
     try:
         # Step 1: Parse and validate request body
         payload = AnalysisNoteCreate.model_validate_json(request.data)
         current_app.logger.info(f"✅ Note creation validated")
-        current_app.logger.debug(f"Note title: {payload.title[:50] if len(payload.title) > 50 else payload.title}")
+        current_app.logger.debug("Note title: %s", payload.title[:50])
     except Exception as e:
-        # Log and print validation error
-        print(f"❌ Request validation error: {str(e)}")
+        # Log validation error
         current_app.logger.error(f"Request validation error: {str(e)}")
         return jsonify({
             "error": {
@@ -648,9 +593,6 @@ def create_profile_note(profile_id):
         }), 400
     
     try:
-        from .db import get_user_profile, create_note
-        import uuid
-        
         # Step 2: Verify profile exists and user owns it
         try:
             profile_uuid = uuid.UUID(profile_id)
@@ -679,7 +621,7 @@ def create_profile_note(profile_id):
                 }
             }), 400
         
-        current_app.logger.debug(f"Profile found with chart: profile_id={profile_id}, chart_id={chart.id}")
+        current_app.logger.debug("Profile found with chart: profile_id=%s, chart_id=%s", profile_id, chart.id)
         
         # Step 4: Create the note
         new_note = create_note(
@@ -724,21 +666,21 @@ def update_note_endpoint(note_id):
         return session_data
     
     # Get authenticated user from Flask g context (set by get_current_user)
-    from flask import g
     user = g.current_user
     
     current_app.logger.info(f"🔵 PATCH /notes/{note_id} - User ID: {user.id}")
     # Don't log full request data (may contain PII)
-    current_app.logger.debug(f"📦 Request Length: {request.content_length or 0} bytes")
+    # Lazy %-formatting: the message is only built if DEBUG is enabled
+    current_app.logger.debug("📦 Request Length: %s bytes", request.content_length or 0)
     
     try:
         # Step 1: Parse and validate request body
         payload = AnalysisNoteUpdate.model_validate_json(request.data)
         current_app.logger.info(f"✅ Note update validated")
-        current_app.logger.debug(f"Update fields: {list(payload.model_dump(exclude_none=True).keys())}")
+        if current_app.logger.isEnabledFor(logging.DEBUG):
+            current_app.logger.debug(f"Update fields: {list(payload.model_dump(exclude_none=True).keys())}")
     except Exception as e:
-        # Log and print validation error
-        print(f"❌ Request validation error: {str(e)}")
+        # Log validation error
         current_app.logger.error(f"Request validation error: {str(e)}")
         return jsonify({
             "error": {
@@ -748,9 +690,6 @@ def update_note_endpoint(note_id):
         }), 400
     
     try:
-        from .db import get_note_by_id, update_note
-        import uuid
-        
         # Step 2: Verify note exists
         try:
             note_uuid = uuid.UUID(note_id)
@@ -821,15 +760,11 @@ def delete_note_endpoint(note_id):
         return session_data
     
     # Get authenticated user from Flask g context (set by get_current_user)
-    from flask import g
     user = g.current_user
     
     current_app.logger.info(f"🔵 DELETE /notes/{note_id} - User ID: {user.id}")
     
     try:
-        from .db import get_note_by_id, delete_note
-        import uuid
-        
         # Step 1: Verify note exists
         try:
             note_uuid = uuid.UUID(note_id)
@@ -1,3 +1,4 @@
+from datetime import datetime
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 
@@ -77,9 +78,10 @@ class DashaRequest(BaseModel):
     longitude: float = Field(ge=-180, le=180)
     depth: int = 3  # 1..3; default 3
     ayanamsha: Optional[str] = None
-    fromDate: Optional[str] = None  # ISO-8601 UTC (e.g., 1991-03-25T04:16:00Z)
-    toDate: Optional[str] = None
-    atDate: Optional[str] = None
+    # ISO-8601 UTC (e.g., 1991-03-25T04:16:00Z), parsed once during validation
+    fromDate: Optional[datetime] = None
+    toDate: Optional[datetime] = None
+    atDate: Optional[datetime] = None
 
     @field_validator("datetime")
     @classmethod
@@ -91,6 +93,20 @@ class DashaRequest(BaseModel):
             raise ValueError("datetime must be in ISO-8601 format")
         return v
 
+    @field_validator("fromDate", "toDate", "atDate", mode="before")
+    @classmethod
+    def _range_date(cls, v):
+        # fromisoformat, not pydantic's lax parsing (which reads "20200101"
+        # as a Unix timestamp)
+        if v is None:
+            return v
+        if not isinstance(v, str):
+            raise ValueError("date must be an ISO-8601 string")
+        try:
+            return datetime.fromisoformat(v)
+        except ValueError:
+            raise ValueError("date must be in ISO-8601 format")
+
     @field_validator("ayanamsha")
     @classmethod
     def _ay(cls, v):
@@ -71,6 +71,9 @@ def post_fork(server, worker):
 
 def post_worker_init(worker):
     """Called just after a worker has initialized the application."""
+    # Warm the DB pool here, in the worker, rather than in the preloading master
+    from app.db import warm_pool
+    warm_pool(worker.wsgi)
     worker.log.info(f"Worker {worker.pid} initialized")
 
 def worker_exit(server, worker):
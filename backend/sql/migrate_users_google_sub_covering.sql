@@ -0,0 +1,29 @@
+-- Migration: covering unique constraint on users.google_sub
+--
+-- Replaces the plain users_google_sub_key constraint and the separate
+-- idx_users_google_sub / idx_users_google_sub_auth indexes with a single
+-- UNIQUE (google_sub) INCLUDE (id, email, is_active), which serves the
+-- per-request authorization lookup as an index-only scan.
+--
+-- Only for databases created before schema.sql defined the covering
+-- constraint; new databases already have it. Run once, outside a transaction
+-- block (CREATE/DROP INDEX CONCURRENTLY cannot run inside one):
+--   psql $DATABASE_URL -f backend/sql/migrate_users_google_sub_covering.sql
+
+-- Step 1: build the new index without blocking writes to users
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS users_google_sub_covering_idx
+    ON users (google_sub) INCLUDE (id, email, is_active);
+
+-- Step 2: swap the constraint onto it. Both statements run in one short
+-- transaction, so google_sub is never without a unique constraint; the new
+-- index is already built, so the lock is held only for catalog updates.
+-- ADD CONSTRAINT ... USING INDEX renames the index to users_google_sub_key.
+BEGIN;
+ALTER TABLE users DROP CONSTRAINT users_google_sub_key;
+ALTER TABLE users
+    ADD CONSTRAINT users_google_sub_key UNIQUE USING INDEX users_google_sub_covering_idx;
+COMMIT;
+
+-- Step 3: drop the indexes the covering constraint makes redundant
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_google_sub;
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_google_sub_auth;
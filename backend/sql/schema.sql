@@ -53,7 +53,7 @@ CREATE TABLE IF NOT EXISTS users (
     
     -- Google's unique user identifier (from "sub" claim in ID token)
     -- This is the reliable identifier even if user changes their Google email
-    google_sub TEXT NOT NULL UNIQUE,
+    google_sub TEXT NOT NULL,
     
     -- User's email from Google OAuth
     -- Stored for convenience but google_sub is the authoritative identifier
@@ -71,11 +71,15 @@ CREATE TABLE IF NOT EXISTS users (
     
     -- Active flag allows account deactivation independent of approved_users
     -- Both users.is_active AND approved_users.is_active must be true for access
-    is_active BOOLEAN NOT NULL DEFAULT true
+    is_active BOOLEAN NOT NULL DEFAULT true,
+    
+    -- google_sub uniqueness, also serving the lookup in every protected request:
+    -- it includes the columns the authorization check selects (index-only scan)
+    CONSTRAINT users_google_sub_key UNIQUE (google_sub) INCLUDE (id, email, is_active)
 );
 
--- Index for fast lookup by google_sub (used in every protected request)
-CREATE INDEX IF NOT EXISTS idx_users_google_sub ON users(google_sub);
+-- Databases created before the covering constraint: run
+-- sql/migrate_users_google_sub_covering.sql once (builds the index CONCURRENTLY)
 
 -- Index for fast lookup by email (used for authorization checks)
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
@@ -161,6 +165,9 @@ CREATE TABLE IF NOT EXISTS profiles (
 -- Indexes for profiles
 CREATE INDEX IF NOT EXISTS idx_profiles_user_id ON profiles(user_id) WHERE is_active = true;
 CREATE INDEX IF NOT EXISTS idx_profiles_user_active ON profiles(user_id, is_active);
+-- Serves the profile list (WHERE user_id = ? AND is_active ORDER BY updated_at DESC LIMIT n)
+-- without a sort step. The dedup lookup is already served by uq_user_profile's unique index.
+CREATE INDEX IF NOT EXISTS idx_profiles_user_updated ON profiles(user_id, updated_at DESC) WHERE is_active = true;
 
 -- Table 4: charts
 -- Cached astrological chart calculation results
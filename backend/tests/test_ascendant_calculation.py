@@ -373,3 +373,40 @@ class TestAscendantCalculation:
         # Verify the ascendant is Taurus (Index: 1)
         asc_sign = sign_index(ascendant_longitudes[0])
         assert asc_sign == 1  # Taurus
+
+    def test_whole_sign_angles_above_polar_circle(self):
+        """Whole sign needs only the angles, so it works where Placidus cusps are undefined"""
+        from app.astro.engine import init_ephemeris
+        
+        # Tromsø, Norway (69.65°N) - Placidus has no solution at this latitude
+        dt_utc = to_utc("1991-03-25T09:46:00", "Europe/Oslo", None)
+        jd_ut = julian_day_utc(dt_utc)
+        init_ephemeris('./ephe', "LAHIRI")
+        
+        asc_long, cusps, angles = ascendant_and_houses(jd_ut, 69.6492, 18.9553, "WHOLE_SIGN")
+        assert cusps is None
+        assert 0 <= asc_long < 360
+        assert angles["asc"] == asc_long
+        assert angles["dsc"] == pytest.approx(norm360(asc_long + 180.0), abs=1e-10)
+
+    def test_memoized_houses_follow_ayanamsha(self):
+        """Cached houses are keyed by ayanamsha and callers get independent copies"""
+        from app.astro.engine import init_ephemeris
+        
+        dt_utc = to_utc("1991-03-25T09:46:00", "Asia/Kolkata", None)
+        jd_ut = julian_day_utc(dt_utc)
+        
+        init_ephemeris('./ephe', "LAHIRI")
+        asc_lahiri, cusps, angles = ascendant_and_houses(jd_ut, 18.5204, 73.8567, "PLACIDUS")
+        cusps.append(0.0)
+        angles["asc"] = 0.0
+        asc_again, cusps_again, angles_again = ascendant_and_houses(jd_ut, 18.5204, 73.8567, "PLACIDUS")
+        assert len(cusps_again) == 12
+        assert angles_again["asc"] == asc_lahiri == asc_again
+        
+        init_ephemeris('./ephe', "VEDANJANAM")
+        try:
+            asc_vedanjanam, _, _ = ascendant_and_houses(jd_ut, 18.5204, 73.8567, "PLACIDUS")
+        finally:
+            init_ephemeris('./ephe', "LAHIRI")
+        assert asc_vedanjanam == pytest.approx(norm360(asc_lahiri - 0.1), abs=1e-10)
@@ -143,7 +143,18 @@ class TestSripatiCuspsCalculation:
         # Verify all sandhis are within valid range
         for sandhi in sandhis:
             assert 0 <= sandhi < 360
-    
+
+    def test_sripati_cusps_memoized_results_are_independent(self):
+        """Test that repeat calls return equal but unshared lists"""
+        first = compute_sripati_cusps(15.0, 100.0, 195.0, 280.0)
+        first["sandhis"][0] = -1.0
+
+        second = compute_sripati_cusps(15.0, 100.0, 195.0, 280.0)
+        assert second["sandhis"][0] != -1.0
+        assert isinstance(second["madhyas"], list)
+        assert len(second["madhyas"]) == 12
+        assert len(second["sandhis"]) == 12
+
     def test_angles_are_opposite(self):
         """Test that IC = MC + 180° and DSC = ASC + 180°"""
         # Initialize ephemeris
@@ -1,7 +1,7 @@
 import pytest
 from app import create_app
 from app.schemas import DashaRequest
-from app.astro.engine import init_ephemeris, julian_day_utc, compute_planets
+from app.astro.engine import init_ephemeris, julian_day_utc, compute_planets, compute_moon_longitude
 from app.astro.utils import to_utc
 from datetime import datetime
 
@@ -122,6 +122,47 @@ def test_dasha_ayanamsha_affects_moon_position(client):
     assert len(timeline_raman) > 0
     assert len(timeline_kp) > 0
 
+def test_compute_moon_longitude_matches_compute_planets():
+    """The Moon-only fast path used by /dasha must agree with compute_planets"""
+    dt_utc = to_utc("1991-03-25T09:46:00", None, None, 18.5204, 73.8567)
+    jd_ut = julian_day_utc(dt_utc)
+    
+    for ayanamsha in ("LAHIRI", "VEDANJANAM"):
+        init_ephemeris('./ephe', ayanamsha)
+        planets = compute_planets(jd_ut, "MEAN")
+        moon = next(p["longitude"] for p in planets if p["planet"] == "Moon")
+        assert compute_moon_longitude(jd_ut) == moon
+
+def test_dasha_request_parses_range_dates():
+    """fromDate/toDate/atDate are parsed to datetimes during validation"""
+    payload = DashaRequest.model_validate_json(
+        b'{"datetime": "1991-03-25T09:46:00", "latitude": 18.5204, "longitude": 73.8567,'
+        b' "fromDate": "2000-01-01T00:00:00Z", "atDate": "2005-06-01"}'
+    )
+    assert payload.fromDate == datetime.fromisoformat("2000-01-01T00:00:00Z")
+    assert payload.atDate == datetime(2005, 6, 1)
+    assert payload.toDate is None
+
+    with pytest.raises(ValueError):
+        DashaRequest.model_validate_json(
+            b'{"datetime": "1991-03-25T09:46:00", "latitude": 18.5204, "longitude": 73.8567,'
+            b' "toDate": "not-a-date"}'
+        )
+
+def test_dasha_request_numeric_date_string_is_iso():
+    """Numeric date strings use ISO basic format, not Unix timestamps"""
+    payload = DashaRequest.model_validate_json(
+        b'{"datetime": "1991-03-25T09:46:00", "latitude": 18.5204, "longitude": 73.8567,'
+        b' "fromDate": "20200101"}'
+    )
+    assert payload.fromDate == datetime(2020, 1, 1)
+
+    with pytest.raises(ValueError):
+        DashaRequest.model_validate_json(
+            b'{"datetime": "1991-03-25T09:46:00", "latitude": 18.5204, "longitude": 73.8567,'
+            b' "atDate": 1577836800}'
+        )
+
 def test_dasha_default_ayanamsha(client):
     """Test that default ayanamsha is used when none is provided"""
     data = {
@@ -1,6 +1,6 @@
 import math
 
-from app.astro.utils import get_nakshatra_and_charan, get_navamsha_info
+from app.astro.utils import get_nakshatra_and_charan, get_navamsha_info, house_from_cusps, houses_from_cusps
 
 
 def approx_equal(a: float, b: float, eps: float = 1e-7) -> bool:
@@ -118,3 +118,21 @@ def test_navamsha_calculation_real_birth_data():
         assert 0 <= nav_info['degreeInNavamsha'] < 3.3334  # 3°20'
 
 
+def test_houses_from_cusps_wraparound():
+    # Cusps starting at 100° wrap past 360° between house 9 (340°) and house 10 (10°)
+    cusps = [(100.0 + 30.0 * i) % 360.0 for i in range(12)]
+    longitudes = [100.0, 129.9, 130.0, 350.0, 5.0, 10.0, 99.9]
+    assert houses_from_cusps(longitudes, cusps) == [1, 1, 2, 9, 9, 10, 12]
+
+    # Unequal (Placidus-like) cusps without wraparound
+    cusps = [0.0, 25.0, 55.0, 90.0, 125.0, 155.0, 180.0, 205.0, 235.0, 270.0, 305.0, 335.0]
+    assert houses_from_cusps([0.0, 24.9, 90.0, 334.9, 359.9], cusps) == [1, 1, 4, 11, 12]
+
+
+def test_houses_from_cusps_matches_sandhi_scan():
+    # Bhav Chalit sandhis end houses, so rotating them gives house-start cusps
+    sandhis = [5.0, 35.0, 65.0, 95.0, 125.0, 155.0, 185.0, 215.0, 245.0, 275.0, 305.0, 335.0]
+    longitudes = [0.0, 4.9, 5.0, 34.9, 200.0, 334.9, 335.0, 359.9]
+    expected = [house_from_cusps(lon, sandhis) for lon in longitudes]
+    assert houses_from_cusps(longitudes, sandhis[-1:] + sandhis[:-1]) == expected
+    assert expected == [1, 1, 2, 2, 8, 12, 1, 1]